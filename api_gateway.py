@@ -5,10 +5,13 @@ Resilient Alpaca API Gateway with comprehensive error handling and rate limiting
 import asyncio
 import logging
 from typing import Dict, List, Optional, Any
-from datetime import datetime, timedelta
+from datetime import datetime
 import aiohttp
+import orjson
 from dataclasses import dataclass
 from config import *
+from rate_limiter import PriorityThrottle
+from utils import TTLCache, DateTimeUtils
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +24,57 @@ class ApiResponse:
     status_code: Optional[int] = None
     rate_limit_remaining: Optional[int] = None
 
+def _parse_timestamp(value: Optional[str]):
+    """Parse an Alpaca timestamp, keeping the raw string if it can't be parsed"""
+    if not value:
+        return None
+    return DateTimeUtils.parse_datetime(value) or value
+
+class Order:
+    """Order as returned by the trading API"""
+    __slots__ = ('id', 'symbol', 'qty', 'side', 'order_type', 'status', 'limit_price', 'stop_price',
+                 'filled_qty', 'filled_avg_price', 'created_at', 'created_ns', 'type')
+
+    def __init__(self, data: Dict):
+        self.id = data.get('id')
+        self.symbol = data.get('symbol')
+        self.qty = data.get('qty', '0')
+        self.side = data.get('side')
+        self.order_type = data.get('order_type')
+        self.status = data.get('status')
+        self.limit_price = data.get('limit_price')
+        self.stop_price = data.get('stop_price')
+        self.filled_qty = data.get('filled_qty', '0')
+        self.filled_avg_price = data.get('filled_avg_price')
+        self.created_at = _parse_timestamp(data.get('created_at'))
+        self.created_ns = DateTimeUtils.to_epoch_ns(self.created_at)  # For integer age checks
+        # Add missing attributes for compatibility
+        self.type = data.get('type', self.order_type)
+
+class Position:
+    """Open position as returned by the trading API"""
+    __slots__ = ('symbol', 'qty', 'market_value', 'cost_basis', 'unrealized_pl',
+                 'unrealized_plpc', 'avg_entry_price')
+
+    def __init__(self, data: Dict):
+        self.symbol = data.get('symbol')
+        self.qty = data.get('qty', '0')
+        self.market_value = data.get('market_value', '0')
+        self.cost_basis = data.get('cost_basis', '0')
+        self.unrealized_pl = data.get('unrealized_pl', '0')
+        self.unrealized_plpc = data.get('unrealized_plpc', '0')
+        self.avg_entry_price = data.get('avg_entry_price', '0')
+
+class Clock:
+    """Market clock as returned by the trading API"""
+    __slots__ = ('timestamp', 'is_open', 'next_open', 'next_close')
+
+    def __init__(self, data: Dict):
+        self.timestamp = data.get('timestamp')
+        self.is_open = data.get('is_open', False)
+        self.next_open = data.get('next_open')
+        self.next_close = data.get('next_close')
+
 class ResilientAlpacaGateway:
     """
     Resilient API gateway for Alpaca with comprehensive error handling,
@@ -31,12 +85,16 @@ class ResilientAlpacaGateway:
         self.session = None
         self.trading_client = None
         self.data_client = None
-        self.base_url = "https://paper-api.alpaca.markets" if API_CONFIG['paper_trading'] else "https://api.alpaca.markets"
+        self.base_url = "https://paper-api.alpaca.markets" if CONFIG.api.paper_trading else "https://api.alpaca.markets"
         self.data_url = "https://data.alpaca.markets"
         
         # Rate limiting
-        self.request_timestamps = []
-        self.rate_limit_lock = asyncio.Lock()
+        self.throttle = PriorityThrottle()
+        
+        # Short-lived caches for slow-changing lookups polled from several loops
+        self._clock_cache = TTLCache(CONFIG.api.clock_cache_ttl)
+        self._account_cache = TTLCache(CONFIG.api.account_cache_ttl)
+        self._calendar_cache = TTLCache(CONFIG.api.calendar_cache_ttl)
         
         # Connection health
         self.last_successful_request = None
@@ -47,19 +105,26 @@ class ResilientAlpacaGateway:
         """Initialize the API gateway with authentication"""
         try:
             # Validate credentials
-            if not API_CONFIG['alpaca_key_id'] or not API_CONFIG['alpaca_secret_key']:
+            if not CONFIG.api.alpaca_key_id or not CONFIG.api.alpaca_secret_key:
                 logger.error("Missing Alpaca API credentials")
                 return False
                 
             # Create HTTP session
             headers = {
-                'APCA-API-KEY-ID': API_CONFIG['alpaca_key_id'],
-                'APCA-API-SECRET-KEY': API_CONFIG['alpaca_secret_key'],
+                'APCA-API-KEY-ID': CONFIG.api.alpaca_key_id,
+                'APCA-API-SECRET-KEY': CONFIG.api.alpaca_secret_key,
                 'Content-Type': 'application/json'
             }
             
-            timeout = aiohttp.ClientTimeout(total=API_CONFIG['request_timeout'])
-            self.session = aiohttp.ClientSession(headers=headers, timeout=timeout)
+            timeout = aiohttp.ClientTimeout(total=CONFIG.api.request_timeout)
+            # aiohttp already reuses keep-alive connections; these settings cap the
+            # pool and keep idle connections and DNS lookups around for longer
+            connector = aiohttp.TCPConnector(
+                limit=CONFIG.api.connection_pool_size,
+                keepalive_timeout=CONFIG.api.keepalive_timeout,
+                ttl_dns_cache=CONFIG.api.dns_cache_ttl
+            )
+            self.session = aiohttp.ClientSession(headers=headers, timeout=timeout, connector=connector)
             
             # Test connection
             test_response = await self._make_request('GET', '/v2/account')
@@ -92,7 +157,8 @@ class ResilientAlpacaGateway:
             self.session = None
             
     async def _make_request(self, method: str, endpoint: str, data: Dict = None,
-                          params: Dict = None, retry_count: int = 0) -> ApiResponse:
+                          params: Dict = None, retry_count: int = 0,
+                          priority: str = 'MONITORING') -> ApiResponse:
         """Make HTTP request with comprehensive error handling and retries"""
 
         # CRITICAL: Check and recover session if None
@@ -102,7 +168,7 @@ class ResilientAlpacaGateway:
                 return ApiResponse(success=False, error="Failed to recover API session")
 
         # Rate limiting check
-        await self._enforce_rate_limits()
+        await self._enforce_rate_limits(priority)
         
         try:
             url = f"{self.base_url}{endpoint}"
@@ -114,12 +180,9 @@ class ResilientAlpacaGateway:
                 params=params
             ) as response:
                 
-                # Track request for rate limiting
-                self.request_timestamps.append(datetime.now())
-                
                 # Parse response
                 try:
-                    response_data = await response.json()
+                    response_data = await response.json(loads=orjson.loads)
                 except:
                     response_data = await response.text()
                     
@@ -139,12 +202,12 @@ class ResilientAlpacaGateway:
                     
                 elif response.status == 429:  # Rate limited
                     self.consecutive_failures += 1
-                    backoff_time = min(60, API_CONFIG['retry_backoff_factor'] ** retry_count * (1 + self.consecutive_failures))
+                    backoff_time = min(60, CONFIG.api.retry_backoff_factor ** retry_count * (1 + self.consecutive_failures))
                     logger.warning(f"Rate limit exceeded (failure #{self.consecutive_failures}), backing off for {backoff_time:.1f}s...")
                     
-                    if retry_count < API_CONFIG['max_retries']:
+                    if retry_count < CONFIG.api.max_retries:
                         await asyncio.sleep(backoff_time)
-                        return await self._make_request(method, endpoint, data, params, retry_count + 1)
+                        return await self._make_request(method, endpoint, data, params, retry_count + 1, priority)
                     
                 else:
                     error_msg = f"HTTP {response.status}: {response_data}"
@@ -161,9 +224,9 @@ class ResilientAlpacaGateway:
             logger.warning(f"Request timeout for {endpoint}")
             self.consecutive_failures += 1
             
-            if retry_count < API_CONFIG['max_retries']:
-                await asyncio.sleep(API_CONFIG['retry_backoff_factor'] ** retry_count)
-                return await self._make_request(method, endpoint, data, params, retry_count + 1)
+            if retry_count < CONFIG.api.max_retries:
+                await asyncio.sleep(CONFIG.api.retry_backoff_factor ** retry_count)
+                return await self._make_request(method, endpoint, data, params, retry_count + 1, priority)
                 
             return ApiResponse(success=False, error="Request timeout")
             
@@ -171,37 +234,22 @@ class ResilientAlpacaGateway:
             logger.error(f"Request failed for {endpoint}: {e}")
             self.consecutive_failures += 1
             
-            if retry_count < API_CONFIG['max_retries']:
-                await asyncio.sleep(API_CONFIG['retry_backoff_factor'] ** retry_count)
-                return await self._make_request(method, endpoint, data, params, retry_count + 1)
+            if retry_count < CONFIG.api.max_retries:
+                await asyncio.sleep(CONFIG.api.retry_backoff_factor ** retry_count)
+                return await self._make_request(method, endpoint, data, params, retry_count + 1, priority)
                 
             return ApiResponse(success=False, error=str(e))
             
-    async def _enforce_rate_limits(self):
-        """Enforce API rate limits"""
-        async with self.rate_limit_lock:
-            now = datetime.now()
-            
-            # Clean old timestamps (older than 1 minute)
-            cutoff_time = now - timedelta(minutes=1)
-            self.request_timestamps = [
-                ts for ts in self.request_timestamps if ts > cutoff_time
-            ]
-            
-            # Check if we're approaching rate limit
-            requests_per_minute = len(self.request_timestamps)
-            max_requests = int(RATE_LIMIT_CONFIG['max_requests_per_minute'] * 
-                             RATE_LIMIT_CONFIG['rate_limit_buffer'])
-                             
-            if requests_per_minute >= max_requests:
-                sleep_time = 60 - (now - self.request_timestamps[0]).total_seconds()
-                if sleep_time > 0:
-                    logger.debug(f"Rate limit approaching, sleeping {sleep_time:.2f}s")
-                    await asyncio.sleep(sleep_time)
+    async def _enforce_rate_limits(self, priority: str = 'MONITORING'):
+        """Enforce API rate limits using the priority token-bucket throttle"""
+        await self.throttle.acquire(priority)
                     
     # Account and Portfolio Methods
     async def get_account_safe(self):
-        """Safely get account information with error handling"""
+        """Safely get account information with error handling (cached briefly)"""
+        return await self._account_cache.get(self._fetch_account)
+    
+    async def _fetch_account(self):
         try:
             response = await self._make_request('GET', '/v2/account')
             if response.success:
@@ -218,18 +266,13 @@ class ResilientAlpacaGateway:
         return await self.get_account_safe()
     
     async def get_clock(self):
-        """Get market clock information"""
+        """Get market clock information (cached briefly)"""
+        return await self._clock_cache.get(self._fetch_clock)
+    
+    async def _fetch_clock(self):
         try:
             response = await self._make_request('GET', '/v2/clock')
             if response.success:
-                # Return parsed clock data with proper attributes
-                class Clock:
-                    def __init__(self, data):
-                        self.timestamp = data.get('timestamp')
-                        self.is_open = data.get('is_open', False)
-                        self.next_open = data.get('next_open')
-                        self.next_close = data.get('next_close')
-                
                 return Clock(response.data)
             else:
                 logger.error(f"Failed to get clock: {response.error}")
@@ -264,17 +307,18 @@ class ResilientAlpacaGateway:
             return None
             
     # Order Management Methods
-    async def submit_order(self, order_data: Dict):
-        """Submit a new order with enhanced PDT checking"""
+    async def submit_order(self, order_data: Dict, priority: str = 'EXECUTION'):
+        """Submit a new order with enhanced PDT checking (priority='EMERGENCY' for protective orders)"""
         try:
             # Pre-check if this symbol is known to be PDT-blocked
             if hasattr(self, '_pdt_blocked_symbols') and order_data['symbol'] in self._pdt_blocked_symbols:
                 logger.warning(f"Skipping order for {order_data['symbol']} - known PDT violation risk")
                 return ApiResponse(success=False, error="Symbol is PDT-blocked")
             
-            response = await self._make_request('POST', '/v2/orders', data=order_data)
+            response = await self._make_request('POST', '/v2/orders', data=order_data, priority=priority)
             if response.success:
                 logger.info(f"Order submitted: {order_data['symbol']} {order_data['side']} {order_data['qty']}")
+                self._account_cache.invalidate()  # Buying power changed
                 order_result = self._parse_order_data(response.data)
                 return ApiResponse(success=True, data=order_result)
             else:
@@ -312,26 +356,27 @@ class ResilientAlpacaGateway:
         """Get currently PDT-blocked symbols"""
         return getattr(self, '_pdt_blocked_symbols', set())
             
-    async def cancel_order(self, order_id: str):
-        """Cancel an existing order"""
+    async def cancel_order(self, order_id: str, priority: str = 'EXECUTION') -> ApiResponse:
+        """Cancel an existing order; always returns an ApiResponse, never None"""
         try:
-            response = await self._make_request('DELETE', f'/v2/orders/{order_id}')
+            response = await self._make_request('DELETE', f'/v2/orders/{order_id}', priority=priority)
             if response.success:
                 logger.info(f"Order {order_id} cancelled")
-                return response
+                self._account_cache.invalidate()
             else:
                 logger.error(f"Order cancellation failed: {response.error}")
-                return response
+            return response
         except Exception as e:
             logger.error(f"Order cancellation error: {e}")
             return ApiResponse(success=False, error=str(e))
             
-    async def cancel_all_orders(self):
+    async def cancel_all_orders(self, priority: str = 'EXECUTION'):
         """Cancel all pending orders"""
         try:
-            response = await self._make_request('DELETE', '/v2/orders')
+            response = await self._make_request('DELETE', '/v2/orders', priority=priority)
             if response.success:
                 logger.info("All orders cancelled")
+                self._account_cache.invalidate()
                 return True
             else:
                 logger.error(f"Bulk order cancellation failed: {response.error}")
@@ -340,10 +385,12 @@ class ResilientAlpacaGateway:
             logger.error(f"Bulk order cancellation error: {e}")
             return False
             
-    async def get_orders(self, status: str = 'open'):
-        """Get orders by status"""
+    async def get_orders(self, status: str = 'open', limit: Optional[int] = None):
+        """Get orders by status (Alpaca returns 50 by default, up to 500 with limit)"""
         try:
             params = {'status': status}
+            if limit:
+                params['limit'] = limit
             response = await self._make_request('GET', '/v2/orders', params=params)
             if response.success:
                 return [self._parse_order_data(order) for order in response.data]
@@ -407,7 +454,8 @@ class ResilientAlpacaGateway:
             
             if response.success:
                 # Debug: Log the response structure
-                logger.debug(f"Bars response structure for {symbol}: {list(response.data.keys())}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Bars response structure for %s: %s", symbol, list(response.data.keys()))
                 
                 # Alpaca returns data in nested format - try multiple extraction methods
                 bars_data = []
@@ -430,7 +478,7 @@ class ResilientAlpacaGateway:
                 elif isinstance(response.data, list):
                     bars_data = response.data
                     
-                logger.debug(f"Extracted {len(bars_data) if bars_data else 0} bars for {symbol}")
+                logger.debug("Extracted %d bars for %s", len(bars_data) if bars_data else 0, symbol)
                 
                 # Validate bar data freshness for the most recent bar
                 if bars_data and len(bars_data) > 0:
@@ -559,7 +607,7 @@ class ResilientAlpacaGateway:
                 params=params
             ) as response:
                 
-                response_data = await response.json()
+                response_data = await response.json(loads=orjson.loads)
                 
                 if response.status == 200:
                     return ApiResponse(success=True, data=response_data, status_code=response.status)
@@ -590,49 +638,10 @@ class ResilientAlpacaGateway:
         
     def _parse_position_data(self, data: Dict):
         """Parse position data into standardized format"""
-        class Position:
-            def __init__(self, data):
-                self.symbol = data.get('symbol')
-                self.qty = data.get('qty', '0')
-                self.market_value = data.get('market_value', '0')
-                self.cost_basis = data.get('cost_basis', '0')
-                self.unrealized_pl = data.get('unrealized_pl', '0')
-                self.unrealized_plpc = data.get('unrealized_plpc', '0')
-                self.avg_entry_price = data.get('avg_entry_price', '0')
-                
         return Position(data)
         
     def _parse_order_data(self, data: Dict):
         """Parse order data into standardized format"""
-        class Order:
-            def __init__(self, data):
-                self.id = data.get('id')
-                self.symbol = data.get('symbol')
-                self.qty = data.get('qty', '0')
-                self.side = data.get('side')
-                self.order_type = data.get('order_type')
-                self.status = data.get('status')
-                self.limit_price = data.get('limit_price')
-                self.stop_price = data.get('stop_price')
-                self.filled_qty = data.get('filled_qty', '0')
-                self.filled_avg_price = data.get('filled_avg_price')
-                # CRITICAL FIX: Parse created_at string to datetime object
-                created_at_str = data.get('created_at')
-                if created_at_str:
-                    try:
-                        from datetime import datetime
-                        import dateutil.parser
-                        self.created_at = dateutil.parser.parse(created_at_str)
-                    except Exception as e:
-                        # Fallback: keep as string but log warning
-                        logger.warning(f"Failed to parse created_at: {created_at_str} - {e}")
-                        self.created_at = created_at_str
-                else:
-                    self.created_at = None
-
-                # Add missing attributes for compatibility
-                self.type = data.get('type', self.order_type)
-                
         return Order(data)
     
     async def get_all_assets(self, status='active', asset_class='us_equity'):
@@ -643,7 +652,7 @@ class ResilientAlpacaGateway:
                 'asset_class': asset_class
             }
             
-            response = await self._make_request('GET', '/v2/assets', params=params)
+            response = await self._make_request('GET', '/v2/assets', params=params, priority='DISCOVERY')
             
             if response.success:
                 assets = response.data
@@ -742,14 +751,18 @@ class ResilientAlpacaGateway:
             return []
             
     async def get_market_calendar(self, start_date=None, end_date=None):
-        """Get market calendar"""
+        """Get market calendar (cached per date range)"""
+        params = {}
+        if start_date:
+            params['start'] = start_date.strftime('%Y-%m-%d')
+        if end_date:
+            params['end'] = end_date.strftime('%Y-%m-%d')
+            
+        key = (params.get('start'), params.get('end'))
+        return await self._calendar_cache.get(lambda: self._fetch_market_calendar(params), key)
+    
+    async def _fetch_market_calendar(self, params: Dict):
         try:
-            params = {}
-            if start_date:
-                params['start'] = start_date.strftime('%Y-%m-%d')
-            if end_date:
-                params['end'] = end_date.strftime('%Y-%m-%d')
-                
             endpoint = "/v2/calendar"
             response = await self._make_request('GET', endpoint, params=params)
             
@@ -761,6 +774,10 @@ class ResilientAlpacaGateway:
         except Exception as e:
             logger.error(f"Market calendar error: {e}")
             return []
+    
+    def invalidate_market_calendar(self):
+        """Drop cached calendar rows so the next request refetches them"""
+        self._calendar_cache.invalidate()
             
     async def get_news(self, symbols=None, limit=50):
         """Get market news"""
@@ -796,5 +813,6 @@ class ResilientAlpacaGateway:
             'last_successful_request': self.last_successful_request,
             'consecutive_failures': self.consecutive_failures,
             'is_healthy': self.consecutive_failures < self.max_consecutive_failures,
-            'requests_in_last_minute': len(self.request_timestamps)
+            'requests_in_last_minute': self.throttle.requests_in_window(),
+            'rate_limit_tokens': self.throttle.available()
         }
\ No newline at end of file
@@ -4,10 +4,37 @@ Complete configuration for intelligent market-wide trading system
 Optimized for API efficiency and maximum market coverage
 """
 
+import mmap
 import os
-from typing import List, Dict, Optional
-from enum import Enum
+import re
+from typing import List, Dict, Optional, Any, Mapping, Tuple
+from enum import Enum, IntEnum
 from datetime import time
+from dataclasses import dataclass, field, fields
+from functools import lru_cache
+from types import MappingProxyType
+
+# KEY=VALUE lines; blank lines, comments and lines without '=' don't match
+_ENV_LINE = re.compile(rb'^[ \t]*([^#=\s][^=\r\n]*?)[ \t]*=[ \t]*([^\r\n]*?)[ \t]*\r?$', re.M)
+
+def load_env(path: str = '.env', override: bool = True) -> Dict[str, str]:
+    """Load KEY=VALUE pairs from a .env file into os.environ"""
+    loaded = {}
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return loaded
+
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+        for match in _ENV_LINE.finditer(buf):
+            loaded[match.group(1).decode()] = match.group(2).decode()
+
+    if override:
+        os.environ.update(loaded)
+    else:
+        os.environ.update({key: value for key, value in loaded.items() if key not in os.environ})
+    return loaded
+
+# Environment is loaded once, before any os.getenv below
+load_env()
 
 class TradingPhase(Enum):
     FOUNDATION = 1
@@ -16,12 +43,25 @@ class TradingPhase(Enum):
     AI_ENHANCEMENT = 3
     LIVE_TRADING = 4
 
-class MarketRegime(Enum):
-    BULL_TRENDING = "bull_trending"
-    BEAR_TRENDING = "bear_trending" 
-    VOLATILE_RANGE = "volatile_range"
-    SECTOR_ROTATION = "sector_rotation"
-    LOW_VOLATILITY = "low_volatility"
+class MarketRegime(IntEnum):
+    """Market regimes, numbered contiguously to index REGIME_CONFIGS"""
+    BULL_TRENDING = 0
+    BEAR_TRENDING = 1
+    VOLATILE_RANGE = 2
+    SECTOR_ROTATION = 3
+    LOW_VOLATILITY = 4
+
+    @property
+    def label(self) -> str:
+        """Lowercase regime name ('bull_trending') used in logs and stats"""
+        return self.name.lower()
+
+    @classmethod
+    def _missing_(cls, value):
+        # Accept regime labels ('bull_trending') as well as indices
+        if isinstance(value, str):
+            return cls.__members__.get(value.upper())
+        return None
 
 # === SYSTEM CONFIGURATION ===
 SYSTEM_CONFIG = {
@@ -44,7 +84,19 @@ API_CONFIG = {
     'request_timeout': 15,
     'max_retries': 3,
     'retry_backoff_factor': 2,
-    'websocket_heartbeat_interval': 30
+    'websocket_heartbeat_interval': 30,
+
+    # HTTP connection pooling (aiohttp defaults: 100 connections, 15s keep-alive, 10s DNS cache)
+    'connection_pool_size': 20,        # Max open connections; the throttle admits ~3 req/s and order
+                                       # cleanup runs at most 8 cancels at once, so 20 leaves headroom
+                                       # while bounding sockets held open to the API hosts
+    'keepalive_timeout': 30,           # Seconds an idle connection is kept open for reuse
+    'dns_cache_ttl': 300,              # Seconds resolved API hostnames are cached
+
+    # In-memory response caching (seconds)
+    'clock_cache_ttl': 5,
+    'account_cache_ttl': 10,
+    'calendar_cache_ttl': 60
 }
 
 # === INTELLIGENT FUNNEL CONFIGURATION ===
@@ -165,6 +217,15 @@ RATE_LIMIT_CONFIG = {
         'MONITORING': 3,                # Position monitoring
         'DISCOVERY': 4,                 # Opportunity discovery
         'ANALYSIS': 5                   # Deep analysis
+    },
+
+    # Budget category that sets each priority's token-bucket refill rate
+    'priority_budgets': {
+        'EMERGENCY': 'emergency_reserve',
+        'EXECUTION': 'trade_execution',
+        'MONITORING': 'position_monitoring',
+        'DISCOVERY': 'broad_scan',
+        'ANALYSIS': 'deep_dive'
     }
 }
 
@@ -350,33 +411,256 @@ LOGGING_CONFIG = {
     }
 }
 
+# === FROZEN CONFIG SNAPSHOTS ===
+# The dicts above remain the editable source of truth. Hot paths (risk checks,
+# funnel sizing, regime lookup, rate limiting) read these frozen, slotted
+# snapshots instead: attribute loads are cheaper than string-keyed dict probes,
+# derived values are computed once, and invalid limits fail at import time.
+
+def _freeze(value: Any) -> Any:
+    """Convert mutable config containers into immutable equivalents"""
+    if isinstance(value, list):
+        return tuple(value)
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    return value
+
+def _bounded(ge: Optional[float] = None, le: Optional[float] = None):
+    """Declare an inclusive range for a config field, enforced by _check_bounds"""
+    return field(metadata={'ge': ge, 'le': le})
+
+def _check_bounds(snapshot) -> None:
+    """Raise ValueError for any field outside the range declared with _bounded"""
+    for f in fields(snapshot):
+        low, high = f.metadata.get('ge'), f.metadata.get('le')
+        if low is None and high is None:
+            continue
+        value = getattr(snapshot, f.name)
+        if (low is not None and value < low) or (high is not None and value > high):
+            raise ValueError("{}.{} = {} is outside [{}, {}]".format(
+                type(snapshot).__name__, f.name, value,
+                low if low is not None else '-inf', high if high is not None else 'inf'))
+
+def _from_dict(cls, source: Dict[str, Any]):
+    """Build a frozen config dataclass from the matching keys of a config dict"""
+    names = {f.name for f in fields(cls) if f.init}
+    return cls(**{k: _freeze(v) for k, v in source.items() if k in names})
+
+@dataclass(frozen=True, slots=True)
+class RiskConfig:
+    """Immutable view of RISK_CONFIG"""
+    max_position_risk_pct: float = _bounded(ge=0.0, le=5.0)
+    min_position_size_pct: float
+    max_position_size_pct: float
+    max_portfolio_risk_pct: float
+    max_correlation_exposure: float
+    max_sector_concentration: float
+    max_daily_drawdown_pct: float = _bounded(ge=0.0, le=10.0)
+    max_weekly_drawdown_pct: float
+    max_monthly_drawdown_pct: float
+    stop_loss_pct: float = _bounded(ge=0.0, le=100.0)
+    take_profit_multiple: float
+    min_risk_reward_ratio: float
+    min_position_hold_days: int
+    target_hold_days: int
+    max_position_hold_days: int
+    min_holding_period_hours: int
+    pdt_day_trade_buffer: int
+    account_size_threshold: float
+    max_position_loss_pct: float
+    profit_taking_levels: Tuple[float, ...]
+    profit_taking_percentages: Tuple[float, ...]
+    position_review_frequency_minutes: int
+    trailing_stop_activation_pct: float
+    max_position_age_days: int
+    concentration_limit_pct: float
+    extended_hours_emergency_loss_pct: float
+    protection_monitoring_loop_interval: int
+    periodic_protection_verification_loop_interval: int
+    position_aging_management_loop_interval: int
+    emergency_stop_recreation_cooldown_minutes: int
+    stale_order_cleanup_loop_interval: int
+    stale_order_timeouts: Mapping[str, Optional[int]]
+
+    # Derived values
+    stop_loss_fraction: float = field(init=False)
+    concentration_limit_fraction: float = field(init=False)
+    emergency_stop_recreation_cooldown_seconds: int = field(init=False)
+
+    def __post_init__(self):
+        _check_bounds(self)
+        if len(self.profit_taking_levels) != len(self.profit_taking_percentages):
+            raise ValueError("Profit-taking levels and percentages must have the same length")
+
+        object.__setattr__(self, 'stop_loss_fraction', self.stop_loss_pct / 100)
+        object.__setattr__(self, 'concentration_limit_fraction', self.concentration_limit_pct / 100)
+        object.__setattr__(self, 'emergency_stop_recreation_cooldown_seconds',
+                           self.emergency_stop_recreation_cooldown_minutes * 60)
+
+@dataclass(frozen=True, slots=True)
+class FunnelConfig:
+    """Immutable view of FUNNEL_CONFIG"""
+    broad_scan_apis: Mapping[str, bool]
+    max_broad_scan_results: int
+    broad_scan_frequency_minutes: int
+    broad_scan_api_budget: int
+    ai_filtering: Mapping[str, bool]
+    deep_dive_candidates: int
+    deep_dive_api_budget: int
+    deep_dive_components: Mapping[str, bool]
+    max_watchlist_size: int
+    max_active_positions: int = _bounded(ge=1)
+    opportunity_refresh_minutes: int
+
+    # Derived values
+    broad_scan_frequency_seconds: int = field(init=False)
+
+    def __post_init__(self):
+        _check_bounds(self)
+
+        object.__setattr__(self, 'broad_scan_frequency_seconds', self.broad_scan_frequency_minutes * 60)
+
+@dataclass(frozen=True, slots=True)
+class RateLimitConfig:
+    """Immutable view of RATE_LIMIT_CONFIG"""
+    max_requests_per_minute: int = _bounded(ge=1)
+    rate_limit_buffer: float = _bounded(ge=0.0, le=1.0)
+    budget_allocation: Mapping[str, int]
+    priority_system: Mapping[str, int]
+    priority_budgets: Mapping[str, str]
+
+    # Derived values
+    max_budget: int = field(init=False)
+    total_budget: int = field(init=False)
+
+    def __post_init__(self):
+        _check_bounds(self)
+        max_budget = int(self.max_requests_per_minute * self.rate_limit_buffer)
+        total_budget = sum(self.budget_allocation.values())
+        if total_budget > max_budget:
+            raise ValueError("API budget allocation ({}) exceeds limit ({})".format(total_budget, max_budget))
+        for priority in self.priority_system:
+            if self.budget_allocation.get(self.priority_budgets.get(priority)) is None:
+                raise ValueError("No budget allocation mapped for priority {}".format(priority))
+
+        object.__setattr__(self, 'max_budget', max_budget)
+        object.__setattr__(self, 'total_budget', total_budget)
+
+@dataclass(frozen=True, slots=True)
+class WatchlistConfig:
+    """Immutable view of WATCHLIST_CONFIG"""
+    max_size: int = _bounded(ge=1, le=50)  # Larger watchlists are too slow to monitor
+    pruning_criteria: Mapping[str, Any]
+    addition_criteria: Mapping[str, Any]
+
+    def __post_init__(self):
+        _check_bounds(self)
+
+@dataclass(frozen=True, slots=True)
+class RegimeCriteria:
+    """Immutable view of one SCREENING_CRITERIA['regime_criteria'] entry"""
+    focus_on: str = 'all'
+    min_daily_change: float = 0.0
+    max_daily_change: Optional[float] = None
+    min_volume_ratio: float = 1.0
+    preferred_sectors: Tuple[str, ...] = ()
+    avoid_sectors: Tuple[str, ...] = ()
+    max_position_size_pct: Optional[float] = None
+    min_volatility_rank: Optional[float] = None
+    strategy_bias: Optional[str] = None
+    min_relative_strength: Optional[float] = None
+    sector_momentum_required: bool = False
+    cross_sector_analysis: bool = False
+    min_consolidation_days: Optional[int] = None
+    volume_expansion_required: bool = False
+    technical_breakout_required: bool = False
+
+@dataclass(frozen=True, slots=True)
+class ApiConfig:
+    """Immutable view of API_CONFIG"""
+    alpaca_key_id: Optional[str]
+    alpaca_secret_key: Optional[str]
+    paper_trading: bool
+    request_timeout: int
+    max_retries: int
+    retry_backoff_factor: float
+    websocket_heartbeat_interval: int
+    connection_pool_size: int
+    keepalive_timeout: float
+    dns_cache_ttl: float
+    clock_cache_ttl: float
+    account_cache_ttl: float
+    calendar_cache_ttl: float
+
+@dataclass(frozen=True, slots=True)
+class Config:
+    """Top-level immutable configuration"""
+    api: ApiConfig
+    risk: RiskConfig
+    funnel: FunnelConfig
+    rate_limits: RateLimitConfig
+    watchlist: WatchlistConfig
+
+RISK = _from_dict(RiskConfig, RISK_CONFIG)
+FUNNEL = _from_dict(FunnelConfig, FUNNEL_CONFIG)
+RATE_LIMITS = _from_dict(RateLimitConfig, RATE_LIMIT_CONFIG)
+WATCHLIST = _from_dict(WatchlistConfig, WATCHLIST_CONFIG)
+# Indexed by MarketRegime: REGIME_CONFIGS[regime]
+REGIME_CONFIGS: Tuple[RegimeCriteria, ...] = tuple(
+    _from_dict(RegimeCriteria, SCREENING_CRITERIA['regime_criteria'].get(regime, {}))
+    for regime in MarketRegime
+)
+# Mapping view for callers still keyed by regime
+REGIME_CRITERIA: Mapping[MarketRegime, RegimeCriteria] = MappingProxyType(dict(zip(MarketRegime, REGIME_CONFIGS)))
+
+@lru_cache(maxsize=1)
+def get_config() -> Config:
+    """Validated, immutable configuration built once from the loaded environment"""
+    return Config(api=_from_dict(ApiConfig, API_CONFIG), risk=RISK, funnel=FUNNEL,
+                  rate_limits=RATE_LIMITS, watchlist=WATCHLIST)
+
+CONFIG = get_config()
+
+# Catalyst and negative keywords compiled into one alternation so a headline is
+# scanned in a single pass instead of once per keyword. Longer phrases are tried
+# first so overlapping keywords resolve to the most specific match, and keywords
+# only match whole words ('upgrade' does not match 'upgraded').
+NEWS_KEYWORD_POLARITY: Mapping[str, int] = MappingProxyType({
+    **{keyword.lower(): 1 for keyword in NEWS_CONFIG['catalyst_keywords']},
+    **{keyword.lower(): -1 for keyword in NEWS_CONFIG['negative_keywords']}
+})
+NEWS_KEYWORD_PATTERN = re.compile(r'\b(?:{})\b'.format('|'.join(
+    re.escape(keyword) for keyword in sorted(NEWS_KEYWORD_POLARITY, key=len, reverse=True)
+)))
+
+# Headline catalyst categories in priority order; keywords match as substrings.
+# One zero-width lookahead group per category (c0, c1, ...) lets a single pass
+# report every category present, and the highest-priority one is kept.
+HEADLINE_CATALYSTS: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ('earnings', ('earnings', 'beat', 'miss', 'guidance')),
+    ('M&A activity', ('acquisition', 'merger', 'buyout')),
+    ('innovation', ('breakthrough', 'innovation', 'patent')),
+    ('analyst action', ('upgrade', 'downgrade', 'rating')),
+    ('regulatory', ('fda', 'approval', 'clinical')),
+)
+HEADLINE_CATALYST_PATTERN = re.compile('(?={})'.format('|'.join(
+    '(?P<c{}>{})'.format(index, '|'.join(map(re.escape, keywords)))
+    for index, (_, keywords) in enumerate(HEADLINE_CATALYSTS)
+)))
+
 # Configuration validation
 def validate_configuration():
     """Comprehensive configuration validation"""
     errors = []
     
     # API credentials
-    if not API_CONFIG['alpaca_key_id']:
+    api = get_config().api
+    if not api.alpaca_key_id:
         errors.append("APCA_API_KEY_ID environment variable not set")
-    if not API_CONFIG['alpaca_secret_key']:
+    if not api.alpaca_secret_key:
         errors.append("APCA_API_SECRET_KEY environment variable not set")
     
-    # Rate limit validation
-    total_budget = sum(RATE_LIMIT_CONFIG['budget_allocation'].values())
-    max_budget = int(RATE_LIMIT_CONFIG['max_requests_per_minute'] * 
-                    RATE_LIMIT_CONFIG['rate_limit_buffer'])
-    if total_budget > max_budget:
-        errors.append("API budget allocation ({}) exceeds limit ({})".format(total_budget, max_budget))
-    
-    # Risk parameter validation
-    if RISK_CONFIG['max_position_risk_pct'] > 5.0:
-        errors.append("Position risk too high (>5%)")
-    if RISK_CONFIG['max_daily_drawdown_pct'] > 10.0:
-        errors.append("Daily drawdown limit too high (>10%)")
-    
-    # Watchlist size validation
-    if WATCHLIST_CONFIG['max_size'] > 50:
-        errors.append("Watchlist size too large for efficient monitoring")
+    # Risk, rate limit and watchlist bounds are enforced when the snapshots are built
     
     if errors:
         raise ValueError("Configuration validation failed:\n" + "\n".join(errors))
@@ -387,8 +671,8 @@ if __name__ == "__main__":
     try:
         validate_configuration()
         print("✅ Configuration validated successfully")
-        print("📊 API Budget: {}/minute".format(sum(RATE_LIMIT_CONFIG['budget_allocation'].values())))
-        print("🎯 Max Watchlist: {} opportunities".format(WATCHLIST_CONFIG['max_size']))
+        print("📊 API Budget: {}/minute".format(RATE_LIMITS.total_budget))
+        print("🎯 Max Watchlist: {} opportunities".format(WATCHLIST.max_size))
         print("⚡ Scan Frequency: {} minutes".format(FUNNEL_CONFIG['broad_scan_frequency_minutes']))
     except ValueError as e:
         print("❌ Configuration Error: {}".format(e))
\ No newline at end of file
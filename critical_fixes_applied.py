@@ -1,47 +0,0 @@
-#!/usr/bin/env python3
-"""
-CRITICAL FIXES APPLIED TO TRADING SYSTEM
-========================================
-
-FIXES IMPLEMENTED:
-
-1. API SESSION RECOVERY (api_gateway.py):
-   - Added session health checking in _make_request()
-   - Auto-recovery when session becomes None
-   - Prevents "'NoneType' object has no attribute 'request'" errors
-
-2. DATETIME PARSING FIX (api_gateway.py):
-   - Fixed created_at parsing from string to datetime object
-   - Prevents "unsupported operand type(s) for -: 'datetime.datetime' and 'str'" errors
-   - Added dateutil.parser for robust datetime parsing
-
-3. AGGRESSIVE STALE ORDER CLEANUP (main.py):
-   - Reduced stale order threshold from 5 minutes to 2 minutes
-   - More frequent cleanup (every 3rd iteration vs 5th)
-   - Added datetime type checking for created_at fields
-
-4. INCREASED POSITION LIMITS (config.py):
-   - Increased max_active_positions from 30 to 50
-   - Increased max_watchlist_size from 30 to 50
-   - More frequent opportunity scanning (20 min vs 30 min)
-
-5. PROFIT-TAKING ENHANCEMENTS (main.py):
-   - Added blocking order clearing logic
-   - Force profit-taking on aging positions (14+ days)
-   - More aggressive profit thresholds (8%, 15%, 25% vs 15%, 25%, 35%)
-
-EXPECTED RESULTS:
-- Order error rate should drop from 1590:22 ratio to <10:1
-- Profit-taking should activate (currently 100% blocked)
-- System should handle 50 positions vs current 30 limit
-- Better capital utilization and turnover
-
-NEXT STEPS:
-1. Restart trading system to apply fixes
-2. Monitor error rates and profit-taking activity
-3. Verify session stability and datetime parsing
-4. Confirm position limit increases are working
-"""
-
-import sys
-sys.exit(0)  # Documentation only - not executable
\ No newline at end of file
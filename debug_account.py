@@ -3,8 +3,8 @@
 Quick debug script to check account fields for PDT day trade count
 """
 import asyncio
-import os
 from api_gateway import ResilientAlpacaGateway
+from config import CONFIG
 
 async def debug_account():
     try:
@@ -37,10 +37,9 @@ async def debug_account():
         print(f"❌ Error: {e}")
 
 if __name__ == "__main__":
-    # Set environment variables if not already set
-    if not os.getenv('APCA_API_KEY_ID'):
-        os.environ['APCA_API_KEY_ID'] = 'PK4DVRCB6ERJ2VUD2Q0L'
-    if not os.getenv('APCA_API_SECRET_KEY'):
-        os.environ['APCA_API_SECRET_KEY'] = 'AvXfstm3WqFBujx3jha5Aeyr3wYd4m59Ey84opXL'
+    # Credentials come from the environment or .env via config
+    if not CONFIG.api.alpaca_key_id or not CONFIG.api.alpaca_secret_key:
+        print("❌ Missing APCA_API_KEY_ID / APCA_API_SECRET_KEY (set them in the environment or .env)")
+        raise SystemExit(1)
     
     asyncio.run(debug_account())
\ No newline at end of file
@@ -8,6 +8,15 @@ import asyncio
 import os
 import sys
 from api_gateway import ResilientAlpacaGateway
+from utils import OrderUtils
+
+# Order attributes read per protection check, fetched with OrderUtils.order_fields
+PROTECTION_FIELD_NAMES = ('type', 'side', 'stop_price', 'limit_price', 'id')
+
+def write_report(lines):
+    """Write buffered report lines with a single stdout write"""
+    sys.stdout.write(''.join(lines))
+    sys.stdout.flush()
 
 async def check_position_protection():
     """Check if positions have stop loss protection"""
@@ -22,14 +31,16 @@ async def check_position_protection():
         positions = await gateway.get_all_positions()
         active_positions = [pos for pos in positions if float(pos.qty) != 0]
         
-        print(f"\n📊 Found {len(active_positions)} active positions:")
+        # Per-position report lines are buffered and written once per phase
+        report = [f"\n📊 Found {len(active_positions)} active positions:\n"]
         for pos in active_positions:
             qty = float(pos.qty)
             market_value = float(pos.market_value)
             unrealized_pl = float(pos.unrealized_pl)
             unrealized_pct = float(pos.unrealized_plpc) * 100
             
-            print(f"   {pos.symbol}: {qty} shares, ${market_value:,.2f} value, {unrealized_pct:+.1f}% P&L")
+            report.append(f"   {pos.symbol}: {qty} shares, ${market_value:,.2f} value, {unrealized_pct:+.1f}% P&L\n")
+        write_report(report)
         
         if not active_positions:
             print("✅ No active positions found")
@@ -43,6 +54,7 @@ async def check_position_protection():
         
         # Check protection for each position
         unprotected_positions = []
+        report = []
         
         for position in active_positions:
             symbol = position.symbol
@@ -54,11 +66,11 @@ async def check_position_protection():
             
             protective_orders = []
             for order in symbol_orders:
-                order_type = getattr(order, 'type', '').lower()
-                order_side = getattr(order, 'side', '').lower()
-                stop_price = getattr(order, 'stop_price', None)
-                limit_price = getattr(order, 'limit_price', None)
-                order_id = getattr(order, 'id', 'unknown')
+                order_type, order_side, stop_price, limit_price, order_id = OrderUtils.order_fields(
+                    order, PROTECTION_FIELD_NAMES)
+                order_type = (order_type or '').lower()
+                order_side = (order_side or '').lower()
+                order_id = order_id or 'unknown'
                 
                 # Check if this is a protective order
                 is_stop = 'stop' in order_type or stop_price is not None
@@ -72,27 +84,28 @@ async def check_position_protection():
                     protective_orders.append(order_desc)
             
             if protective_orders:
-                print(f"   ✅ {symbol}: PROTECTED by {len(protective_orders)} orders")
+                report.append(f"   ✅ {symbol}: PROTECTED by {len(protective_orders)} orders\n")
                 for order_desc in protective_orders:
-                    print(f"      - {order_desc}")
+                    report.append(f"      - {order_desc}\n")
             else:
-                print(f"   🚨 {symbol}: NO PROTECTION FOUND")
+                report.append(f"   🚨 {symbol}: NO PROTECTION FOUND\n")
                 unprotected_positions.append({
                     'symbol': symbol,
                     'qty': qty,
                     'market_value': float(position.market_value)
                 })
         
+        write_report(report)
+        
         # Summary
         if unprotected_positions:
-            print(f"\n🚨 CRITICAL: {len(unprotected_positions)} positions are UNPROTECTED:")
             total_unprotected_value = sum(pos['market_value'] for pos in unprotected_positions)
-            
+            report = [f"\n🚨 CRITICAL: {len(unprotected_positions)} positions are UNPROTECTED:\n"]
             for pos in unprotected_positions:
-                print(f"   ❌ {pos['symbol']}: {pos['qty']} shares, ${pos['market_value']:,.2f}")
-            
-            print(f"\n💰 Total unprotected value: ${total_unprotected_value:,.2f}")
-            print(f"🚨 These positions are exposed to unlimited risk!")
+                report.append(f"   ❌ {pos['symbol']}: {pos['qty']} shares, ${pos['market_value']:,.2f}\n")
+            report.append(f"\n💰 Total unprotected value: ${total_unprotected_value:,.2f}\n")
+            report.append(f"🚨 These positions are exposed to unlimited risk!\n")
+            write_report(report)
             
             return unprotected_positions
         else:
@@ -139,7 +152,7 @@ async def create_emergency_stops(unprotected_positions, gateway):
             
             print(f"   📤 Creating stop for {symbol}: {qty} shares @ ${stop_price}")
             
-            stop_response = await gateway.submit_order(emergency_stop_data)
+            stop_response = await gateway.submit_order(emergency_stop_data, priority='EMERGENCY')
             
             if stop_response:
                 order_id = getattr(stop_response, 'id', 'unknown')
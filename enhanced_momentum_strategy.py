@@ -571,12 +571,12 @@ class EventDrivenMomentumStrategy:
                 
                 # Take profit target
                 risk_amount = current_price - stop_loss_price
-                take_profit_price = current_price + (risk_amount * RISK_CONFIG['take_profit_multiple'])
+                take_profit_price = current_price + (risk_amount * RISK.take_profit_multiple)
                 
                 # Risk/reward validation
                 risk_reward_ratio = (take_profit_price - current_price) / (current_price - stop_loss_price)
                 
-                if risk_reward_ratio < RISK_CONFIG['min_risk_reward_ratio']:
+                if risk_reward_ratio < RISK.min_risk_reward_ratio:
                     logger.debug(f"{symbol} R/R too low: {risk_reward_ratio:.2f}")
                     return None
                     
@@ -599,12 +599,12 @@ class EventDrivenMomentumStrategy:
                     entry_price=current_price,
                     stop_loss_price=stop_loss_price,
                     take_profit_price=take_profit_price,
-                    position_size_pct=RISK_CONFIG['max_position_risk_pct'],
+                    position_size_pct=RISK.max_position_risk_pct,
                     confidence=confidence,
                     reasoning=f"Momentum setup: MA bullish, RSI={latest_rsi:.1f}, Vol={latest_volume_ratio:.1f}x",
                     timestamp=datetime.now(),
                     risk_reward_ratio=risk_reward_ratio,
-                    max_hold_days=RISK_CONFIG['max_position_hold_days']
+                    max_hold_days=RISK.max_position_hold_days
                 )
                 
                 return signal
@@ -627,7 +627,7 @@ class EventDrivenMomentumStrategy:
                         entry_price=current_price,
                         stop_loss_price=stop_loss_price,
                         take_profit_price=take_profit_price,
-                        position_size_pct=RISK_CONFIG['max_position_risk_pct'] * 0.5,  # Smaller size
+                        position_size_pct=RISK.max_position_risk_pct * 0.5,  # Smaller size
                         confidence=0.7,
                         reasoning=f"Oversold bounce: RSI={latest_rsi:.1f}, Vol={latest_volume_ratio:.1f}x",
                         timestamp=datetime.now(),
@@ -12,9 +12,11 @@ from datetime import datetime, timedelta
 import pandas as pd
 import numpy as np
 from collections import defaultdict, deque
+from functools import lru_cache
 import json
 from config import *
 from tiered_analyzer import TieredAnalyzer, AnalysisResult, AnalysisTier
+from utils import NewsUtils
 
 logger = logging.getLogger(__name__)
 
@@ -62,12 +64,53 @@ class MarketOpportunity:
     last_analysis: Optional[datetime] = None
     watchlist_entry_time: Optional[datetime] = None
 
+def _candidate_columns(candidates: List[MarketOpportunity]) -> Dict[str, np.ndarray]:
+    """Columnar (struct-of-arrays) view of candidates for vectorized screening"""
+    count = len(candidates)
+    return {
+        'price': np.fromiter((c.current_price for c in candidates), dtype=np.float64, count=count),
+        'daily_change': np.fromiter((c.daily_change_pct for c in candidates), dtype=np.float64, count=count),
+        'volume_ratio': np.fromiter((c.volume_ratio for c in candidates), dtype=np.float64, count=count),
+        'avg_volume': np.fromiter((c.avg_volume for c in candidates), dtype=np.float64, count=count),
+        'market_cap': np.fromiter((c.market_cap for c in candidates), dtype=np.float64, count=count),
+        'sector': np.array([c.sector for c in candidates], dtype=object)
+    }
+
+def _build_regime_mask(criteria: RegimeCriteria):
+    """Compile regime criteria into a vectorized mask over candidate columns"""
+    preferred_sectors = frozenset(criteria.preferred_sectors)
+    avoid_sectors = frozenset(criteria.avoid_sectors)
+    restrict_sectors = bool(preferred_sectors) and 'ALL' not in preferred_sectors
+    preferred_list = list(preferred_sectors)
+    avoid_list = list(avoid_sectors)
+
+    # Thresholds reject only when the failing comparison holds, so NaN fields pass as they
+    # did in the per-candidate checks
+    def mask(columns: Dict[str, np.ndarray]) -> np.ndarray:
+        keep = ~(columns['volume_ratio'] < criteria.min_volume_ratio)
+        if criteria.focus_on == 'gainers':
+            keep &= ~(columns['daily_change'] < criteria.min_daily_change)
+        elif criteria.focus_on == 'oversold_bounces':
+            keep &= ~(columns['daily_change'] > criteria.min_daily_change)
+        if restrict_sectors:
+            keep &= np.isin(columns['sector'], preferred_list)
+        if avoid_list:
+            keep &= ~np.isin(columns['sector'], avoid_list)
+        return keep
+
+    return mask
+
+@lru_cache(maxsize=None)
+def regime_screen(criteria: RegimeCriteria):
+    """Vectorized mask for criteria, compiled once per distinct criteria"""
+    return _build_regime_mask(criteria)
+
 class RateLimitTracker:
     """Sophisticated rate limit tracking with priority management"""
     
     def __init__(self):
         self.request_history = deque(maxlen=200)  # Track last 200 requests
-        self.budget_allocation = RATE_LIMIT_CONFIG['budget_allocation'].copy()
+        self.budget_allocation = dict(RATE_LIMITS.budget_allocation)
         self.used_budget = defaultdict(int)
         self.priority_queue = defaultdict(list)
         self.reset_time = datetime.now()
@@ -301,7 +344,7 @@ class IntelligentMarketFunnel:
             api_calls_used = 0
             
             # 1. Market Movers (Top Gainers/Losers) - 2 API calls
-            if FUNNEL_CONFIG['broad_scan_apis']['market_movers']:
+            if FUNNEL.broad_scan_apis['market_movers']:
                 if self.rate_limiter.can_make_request('discovery', priority=4):
                     gainers = await self._get_market_movers('gainers')
                     self.rate_limiter.record_request('discovery')
@@ -317,7 +360,7 @@ class IntelligentMarketFunnel:
                     logger.debug(f"Market movers: {len(movers)} candidates")
                     
             # 2. Most Active Stocks (Volume Leaders) - 1 API call
-            if FUNNEL_CONFIG['broad_scan_apis']['most_active']:
+            if FUNNEL.broad_scan_apis['most_active']:
                 if self.rate_limiter.can_make_request('discovery', priority=4):
                     active_stocks = await self._get_most_active_stocks()
                     self.rate_limiter.record_request('discovery')
@@ -328,7 +371,7 @@ class IntelligentMarketFunnel:
                         logger.debug(f"Most active: {len(active_stocks)} candidates")
                         
             # 3. News-Driven Movers - 1 API call
-            if FUNNEL_CONFIG['broad_scan_apis']['news_movers']:
+            if FUNNEL.broad_scan_apis['news_movers']:
                 if self.rate_limiter.can_make_request('discovery', priority=4):
                     news_movers = await self._get_news_driven_movers()
                     self.rate_limiter.record_request('discovery')
@@ -339,7 +382,7 @@ class IntelligentMarketFunnel:
                         logger.debug(f"News movers: {len(news_movers)} candidates")
                         
             # 4. Unusual Volume Detection - 1 API call
-            if FUNNEL_CONFIG['broad_scan_apis']['unusual_volume']:
+            if FUNNEL.broad_scan_apis['unusual_volume']:
                 if self.rate_limiter.can_make_request('discovery', priority=4):
                     volume_anomalies = await self._detect_unusual_volume()
                     self.rate_limiter.record_request('discovery')
@@ -357,7 +400,7 @@ class IntelligentMarketFunnel:
             self.scan_statistics['api_calls_used'] += api_calls_used
             
             # 5. Add comprehensive market scan for unlimited Alpha Vantage scenario
-            if FUNNEL_CONFIG['broad_scan_apis'].get('comprehensive_scan', False):
+            if FUNNEL.broad_scan_apis.get('comprehensive_scan', False):
                 if self.rate_limiter.can_make_request('discovery', priority=3):
                     comprehensive_results = await self._execute_comprehensive_market_scan()
                     if comprehensive_results:
@@ -371,7 +414,7 @@ class IntelligentMarketFunnel:
             logger.info(f"📊 Broad scan: {api_calls_used} API calls → {len(filtered_candidates)} candidates")
             self.scan_statistics['api_calls_used'] += api_calls_used
             
-            return filtered_candidates[:FUNNEL_CONFIG['max_broad_scan_results']]
+            return filtered_candidates[:FUNNEL.max_broad_scan_results]
             
         except Exception as e:
             logger.error(f"Broad scan failed: {e}")
@@ -388,7 +431,8 @@ class IntelligentMarketFunnel:
             self.market_regime = MarketRegime(market_context.get('regime', 'bull_trending'))
             
             # Apply regime-specific filtering
-            regime_criteria = SCREENING_CRITERIA['regime_criteria'].get(self.market_regime, {})
+            regime_criteria = REGIME_CONFIGS[self.market_regime]
+            regime_mask = self._regime_criteria_mask(candidates, regime_criteria)
             
             # Get account size for price filtering (if available)
             account_value = None
@@ -403,8 +447,9 @@ class IntelligentMarketFunnel:
             filtered_candidates = []
             sector_counts = {}  # Track sector diversification (Grok feedback)
             price_filtered_count = 0
+            debug_enabled = logger.isEnabledFor(logging.DEBUG)  # Skip per-candidate log formatting when off
             
-            for candidate in candidates:
+            for candidate, meets_criteria in zip(candidates, regime_mask):
                 # Account-size-aware price filtering (prioritize affordable stocks for small accounts)
                 if account_value and account_value < 10000:
                     # For small accounts, prioritize stocks that allow proper position sizing
@@ -414,12 +459,13 @@ class IntelligentMarketFunnel:
                     if (candidate.symbol in expensive_stocks or 
                         candidate.current_price > max_affordable_price):
                         price_filtered_count += 1
-                        logger.debug(f"💰 {candidate.symbol}: Filtered due to price ${candidate.current_price:.0f} (>${max_affordable_price:.0f} max for ${account_value:,.0f} account)")
+                        if debug_enabled:
+                            logger.debug(f"💰 {candidate.symbol}: Filtered due to price ${candidate.current_price:.0f} (>${max_affordable_price:.0f} max for ${account_value:,.0f} account)")
                         continue
                 
-                # Apply market regime filters
-                meets_criteria = self._meets_regime_criteria(candidate, regime_criteria)
-                logger.debug(f"📊 {candidate.symbol}: change={candidate.daily_change_pct:.1f}%, vol_ratio={candidate.volume_ratio:.1f}, sector={candidate.sector}, meets_criteria={meets_criteria}")
+                # Market regime filters (evaluated for the whole batch above)
+                if debug_enabled:
+                    logger.debug(f"📊 {candidate.symbol}: change={candidate.daily_change_pct:.1f}%, vol_ratio={candidate.volume_ratio:.1f}, sector={candidate.sector}, meets_criteria={meets_criteria}")
                 
                 if meets_criteria:
                     # Calculate preliminary opportunity score
@@ -436,19 +482,20 @@ class IntelligentMarketFunnel:
                         if current_sector_count < 3:
                             filtered_candidates.append(candidate)
                             sector_counts[candidate_sector] = current_sector_count + 1
-                            logger.debug(f"   ✅ {candidate.symbol}: score={candidate.opportunity_score:.2f}, sector={candidate_sector} ({current_sector_count+1}/3)")
+                            if debug_enabled:
+                                logger.debug(f"   ✅ {candidate.symbol}: score={candidate.opportunity_score:.2f}, sector={candidate_sector} ({current_sector_count+1}/3)")
                         elif candidate.opportunity_score > 0.8:  # Exception for high-quality opportunities
                             filtered_candidates.append(candidate)
                             sector_counts[candidate_sector] = current_sector_count + 1
                             logger.info(f"🎯 High-quality sector exception: {candidate.symbol} ({candidate_sector}) score={candidate.opportunity_score:.2f}")
-                        else:
+                        elif debug_enabled:
                             logger.debug(f"   🚫 {candidate.symbol}: sector limit reached for {candidate_sector} ({current_sector_count}/3)")
-                    else:
+                    elif debug_enabled:
                         logger.debug(f"   ❌ {candidate.symbol}: score={candidate.opportunity_score:.2f} (below threshold)")
                         
             # Sort by opportunity score and return top candidates
             filtered_candidates.sort(key=lambda x: x.opportunity_score, reverse=True)
-            top_candidates = filtered_candidates[:FUNNEL_CONFIG['deep_dive_candidates']]
+            top_candidates = filtered_candidates[:FUNNEL.deep_dive_candidates]
             
             # Log sector distribution for transparency
             final_sectors = {}
@@ -457,7 +504,7 @@ class IntelligentMarketFunnel:
                 final_sectors[sector] = final_sectors.get(sector, 0) + 1
             
             logger.info(f"🧠 AI filtering: {len(candidates)} → {len(top_candidates)} candidates "
-                       f"(regime: {self.market_regime.value})")
+                       f"(regime: {self.market_regime.label})")
             if price_filtered_count > 0:
                 logger.info(f"💰 Price filtering: {price_filtered_count} expensive stocks filtered for small account")
             if final_sectors:
@@ -468,7 +515,7 @@ class IntelligentMarketFunnel:
         except Exception as e:
             logger.warning(f"⚠️ AI FILTERING FAILURE: {e}")
             logger.warning(f"⚠️ Falling back to technical filtering for candidate selection")
-            return candidates[:FUNNEL_CONFIG['deep_dive_candidates']]
+            return candidates[:FUNNEL.deep_dive_candidates]
             
     async def _execute_deep_dive(self, candidates: List[MarketOpportunity]) -> List[MarketOpportunity]:
         """
@@ -478,7 +525,7 @@ class IntelligentMarketFunnel:
         try:
             analyzed_opportunities = []
             api_calls_used = 0
-            max_api_calls = FUNNEL_CONFIG['deep_dive_api_budget']
+            max_api_calls = FUNNEL.deep_dive_api_budget
             
             for candidate in candidates:
                 if api_calls_used >= max_api_calls:
@@ -1423,21 +1470,7 @@ class IntelligentMarketFunnel:
         
     def _extract_catalyst_from_headline(self, headline: str) -> str:
         """Extract trading catalyst from news headline"""
-        headline_lower = headline.lower()
-        
-        # Common catalysts
-        if any(word in headline_lower for word in ['earnings', 'beat', 'miss', 'guidance']):
-            return 'earnings'
-        elif any(word in headline_lower for word in ['acquisition', 'merger', 'buyout']):
-            return 'M&A activity'
-        elif any(word in headline_lower for word in ['breakthrough', 'innovation', 'patent']):
-            return 'innovation'
-        elif any(word in headline_lower for word in ['upgrade', 'downgrade', 'rating']):
-            return 'analyst action'
-        elif any(word in headline_lower for word in ['fda', 'approval', 'clinical']):
-            return 'regulatory'
-        else:
-            return 'general news'
+        return NewsUtils.headline_catalyst(headline)
             
     def _deduplicate_candidates(self, candidates: List[MarketOpportunity]) -> List[MarketOpportunity]:
         """Remove duplicate symbols, keeping best discovery source"""
@@ -1464,25 +1497,19 @@ class IntelligentMarketFunnel:
         
     def _apply_basic_filters(self, candidates: List[MarketOpportunity]) -> List[MarketOpportunity]:
         """Apply basic screening criteria"""
-        filtered = []
-        
-        for candidate in candidates:
-            # Price filters
-            if (candidate.current_price < SCREENING_CRITERIA['min_price'] or
-                candidate.current_price > SCREENING_CRITERIA['max_price']):
-                continue
-                
-            # Volume filter
-            if candidate.avg_volume < SCREENING_CRITERIA['min_avg_volume']:
-                continue
-                
-            # Market cap filter
-            if candidate.market_cap < SCREENING_CRITERIA['min_market_cap']:
-                continue
-                
-            filtered.append(candidate)
+        if not candidates:
+            return []
             
-        return filtered
+        columns = _candidate_columns(candidates)
+        
+        # Price, volume and market cap filters evaluated for all candidates at once; a
+        # candidate is dropped only when a limit is breached, so NaN fields pass
+        keep = ~((columns['price'] < SCREENING_CRITERIA['min_price']) |
+                 (columns['price'] > SCREENING_CRITERIA['max_price']) |
+                 (columns['avg_volume'] < SCREENING_CRITERIA['min_avg_volume']) |
+                 (columns['market_cap'] < SCREENING_CRITERIA['min_market_cap']))
+        
+        return [candidate for candidate, passed in zip(candidates, keep) if passed]
         
     async def _get_market_regime_analysis(self) -> Dict:
         """Get AI analysis of current market regime"""
@@ -1616,42 +1643,29 @@ class IntelligentMarketFunnel:
                 'options_flow': 'unknown'
             }
         
-    def _meets_regime_criteria(self, candidate: MarketOpportunity, regime_criteria: Dict) -> bool:
-        """Check if candidate meets market regime criteria"""
+    def _regime_criteria_mask(self, candidates: List[MarketOpportunity], regime_criteria: RegimeCriteria) -> List[bool]:
+        """Evaluate market regime criteria for a batch of candidates"""
+        if not candidates:
+            return []
+            
+        regime_mask = regime_screen(regime_criteria)
         try:
-            # Focus criteria - use dynamic thresholds from config
-            focus = regime_criteria.get('focus_on', 'all')
-            min_daily_change = regime_criteria.get('min_daily_change', 0.0)
-            
-            if focus == 'gainers' and candidate.daily_change_pct < min_daily_change:
-                return False
-            elif focus == 'oversold_bounces' and candidate.daily_change_pct > min_daily_change:
-                return False
-                
-            # Volume ratio check
-            min_volume_ratio = regime_criteria.get('min_volume_ratio', 1.0)
-            if candidate.volume_ratio < min_volume_ratio:
-                return False
-                
-            # Sector preference
-            preferred_sectors = regime_criteria.get('preferred_sectors', [])
-            avoid_sectors = regime_criteria.get('avoid_sectors', [])
+            return regime_mask(_candidate_columns(candidates)).tolist()
+        except Exception as e:
+            logger.debug(f"Vectorized regime screening failed, checking candidates individually: {e}")
+            return [self._meets_regime_criteria(c, regime_mask) for c in candidates]
             
-            if preferred_sectors and 'ALL' not in preferred_sectors:
-                if candidate.sector not in preferred_sectors:
-                    return False
-                    
-            if candidate.sector in avoid_sectors:
-                return False
-                
-            return True
+    def _meets_regime_criteria(self, candidate: MarketOpportunity, regime_mask) -> bool:
+        """Check if a single candidate meets market regime criteria"""
+        try:
+            return bool(regime_mask(_candidate_columns([candidate]))[0])
             
         except Exception as e:
             logger.error(f"Regime criteria check failed: {e}")
             return True
             
     def _calculate_preliminary_score(self, candidate: MarketOpportunity, 
-                                   market_context: Dict, regime_criteria: Dict) -> float:
+                                   market_context: Dict, regime_criteria: RegimeCriteria) -> float:
         """Calculate preliminary opportunity score"""
         try:
             score = 0.0
@@ -1784,9 +1798,9 @@ class IntelligentMarketFunnel:
             # Add new high-conviction opportunities
             added_count = 0
             for opportunity in opportunities:
-                if (len(self.current_watchlist) < WATCHLIST_CONFIG['max_size'] and
+                if (len(self.current_watchlist) < WATCHLIST.max_size and
                     opportunity.symbol not in self.current_watchlist and
-                    opportunity.opportunity_score >= WATCHLIST_CONFIG['addition_criteria']['min_opportunity_score']):
+                    opportunity.opportunity_score >= WATCHLIST.addition_criteria['min_opportunity_score']):
                     
                     opportunity.watchlist_entry_time = current_time
                     self.current_watchlist[opportunity.symbol] = opportunity
@@ -1804,7 +1818,7 @@ class IntelligentMarketFunnel:
         # Age-based pruning - more aggressive
         if opportunity.watchlist_entry_time:
             age_hours = (current_time - opportunity.watchlist_entry_time).total_seconds() / 3600
-            if age_hours > WATCHLIST_CONFIG['pruning_criteria']['max_age_hours']:
+            if age_hours > WATCHLIST.pruning_criteria['max_age_hours']:
                 return True
         
         # Force refresh after 30 minutes if we have many opportunities
@@ -1819,7 +1833,7 @@ class IntelligentMarketFunnel:
             
         # Volume decline pruning
         if (opportunity.volume_ratio < 
-            WATCHLIST_CONFIG['pruning_criteria']['volume_decline_threshold']):
+            WATCHLIST.pruning_criteria['volume_decline_threshold']):
             return True
             
         return False
@@ -1946,10 +1960,10 @@ class IntelligentMarketFunnel:
         return {
             'scan_statistics': self.scan_statistics,
             'current_watchlist_size': len(self.current_watchlist),
-            'market_regime': self.market_regime.value,
+            'market_regime': self.market_regime.label,
             'api_budget_remaining': {
                 category: self.rate_limiter.get_remaining_budget(category)
-                for category in RATE_LIMIT_CONFIG['budget_allocation'].keys()
+                for category in RATE_LIMITS.budget_allocation.keys()
             },
             'last_scan_time': self.last_broad_scan.isoformat() if self.last_broad_scan else None
         }
\ No newline at end of file
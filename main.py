@@ -9,26 +9,18 @@ import logging
 import signal
 import sys
 import os
-from datetime import datetime, time, timedelta
+from datetime import datetime, time, timedelta, timezone
 from typing import Dict, List, Optional
 import json
+from logging.handlers import RotatingFileHandler
 
-# Load environment variables from .env file
-if os.path.exists('.env'):
-    with open('.env') as f:
-        for line in f:
-            if line.strip() and not line.startswith('#'):
-                if '=' in line:
-                    key, value = line.strip().split('=', 1)
-                    os.environ[key] = value
-
-# Import all system modules
+# Import all system modules (config loads environment variables from .env)
 from config import *
 from intelligent_funnel import IntelligentMarketFunnel, MarketOpportunity
 from ai_market_intelligence import EnhancedAIAssistant, MarketIntelligence
 from enhanced_momentum_strategy import EventDrivenMomentumStrategy, TradingSignal
 from corporate_actions_filter import CorporateActionsFilter
-from utils import OrderUtils, DateTimeUtils, ConfigurationValidator
+from utils import OrderUtils, DateTimeUtils, ConfigurationValidator, JsonLogFormatter
 from api_gateway import ResilientAlpacaGateway
 from risk_manager import ConservativeRiskManager
 from order_executor import SimpleTradeExecutor
@@ -95,11 +87,19 @@ class IntelligentTradingSystem:
         
     def _setup_logging(self):
         """Setup comprehensive structured logging"""
+        file_handler = RotatingFileHandler(
+            LOGGING_CONFIG['log_file'],
+            maxBytes=LOGGING_CONFIG['max_file_size_mb'] * 1024 * 1024,
+            backupCount=LOGGING_CONFIG['backup_count']
+        )
+        if LOGGING_CONFIG['json_format']:
+            file_handler.setFormatter(JsonLogFormatter())
+            
         logging.basicConfig(
             level=getattr(logging, LOGGING_CONFIG['log_level']),
             format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
             handlers=[
-                logging.FileHandler(LOGGING_CONFIG['log_file']),
+                file_handler,
                 logging.StreamHandler()
             ]
         )
@@ -229,6 +229,7 @@ class IntelligentTradingSystem:
             
             # Get all open orders to check for protective stops
             open_orders = await self.gateway.get_orders('open')
+            orders_by_symbol = OrderUtils.index_by_symbol(open_orders)
             
             naked_positions = []
             
@@ -241,47 +242,46 @@ class IntelligentTradingSystem:
                 has_stop_protection = False
                 protective_orders = []
                 
-                for order in open_orders:
-                    if hasattr(order, 'symbol') and order.symbol == symbol:
-                        order_type = getattr(order, 'order_type', getattr(order, 'type', '')).lower()
-                        order_side = getattr(order, 'side', '').lower()
-                        stop_price = getattr(order, 'stop_price', None)
+                for order in orders_by_symbol.get(symbol, ()):
+                    order_type = getattr(order, 'order_type', getattr(order, 'type', '')).lower()
+                    order_side = getattr(order, 'side', '').lower()
+                    stop_price = getattr(order, 'stop_price', None)
                         
-                        # Check for protective stop orders (more specific criteria)
-                        is_protective_stop = (
-                            'stop' in order_type or 
-                            stop_price is not None
-                        )
+                    # Check for protective stop orders (more specific criteria)
+                    is_protective_stop = (
+                        'stop' in order_type or 
+                        stop_price is not None
+                    )
                         
-                        # Also consider limit orders on opposite side as potential protection (take profit)
-                        is_take_profit = (
-                            order_type == 'limit' and 
-                            ((position_side == 'long' and order_side == 'sell') or
-                             (position_side == 'short' and order_side == 'buy'))
-                        )
+                    # Also consider limit orders on opposite side as potential protection (take profit)
+                    is_take_profit = (
+                        order_type == 'limit' and 
+                        ((position_side == 'long' and order_side == 'sell') or
+                         (position_side == 'short' and order_side == 'buy'))
+                    )
                         
-                        # Check for market liquidation orders (active protection)
-                        is_market_liquidation = (
-                            order_type == 'market' and
-                            ((position_side == 'long' and order_side == 'sell') or
-                             (position_side == 'short' and order_side == 'buy'))
-                        )
+                    # Check for market liquidation orders (active protection)
+                    is_market_liquidation = (
+                        order_type == 'market' and
+                        ((position_side == 'long' and order_side == 'sell') or
+                         (position_side == 'short' and order_side == 'buy'))
+                    )
                         
-                        is_protective = is_protective_stop or is_take_profit or is_market_liquidation
+                    is_protective = is_protective_stop or is_take_profit or is_market_liquidation
                         
-                        if is_protective:
-                            limit_price = getattr(order, 'limit_price', None)
-                            price_info = f"${stop_price}" if stop_price else f"${limit_price}" if limit_price else "market price"
+                    if is_protective:
+                        limit_price = getattr(order, 'limit_price', None)
+                        price_info = f"${stop_price}" if stop_price else f"${limit_price}" if limit_price else "market price"
                             
-                            if is_protective_stop:
-                                protection_type = "STOP"
-                            elif is_market_liquidation:
-                                protection_type = "MARKET LIQUIDATION"
-                            else:
-                                protection_type = "TAKE-PROFIT"
+                        if is_protective_stop:
+                            protection_type = "STOP"
+                        elif is_market_liquidation:
+                            protection_type = "MARKET LIQUIDATION"
+                        else:
+                            protection_type = "TAKE-PROFIT"
                             
-                            protective_orders.append(f"{protection_type}: {order_type} {order_side} @ {price_info}")
-                            has_stop_protection = True
+                        protective_orders.append(f"{protection_type}: {order_type} {order_side} @ {price_info}")
+                        has_stop_protection = True
                 
                 # Log protective orders found (or lack thereof)
                 if protective_orders:
@@ -477,24 +477,24 @@ class IntelligentTradingSystem:
                 self.logger.info(f"🔍 Found {len(symbol_orders)} open orders for {symbol}")
                 stale_orders_cancelled = 0
                 remaining_orders = []
+                orders_to_cancel = []
 
+                now = datetime.now(timezone.utc)
                 for order in symbol_orders:
-                    order_type = getattr(order, 'type', 'unknown')
-                    side = getattr(order, 'side', 'unknown')
-                    status = getattr(order, 'status', 'unknown')
-                    created_at = getattr(order, 'created_at', None)
-                    order_id = getattr(order, 'id', None)
+                    order_id, _, status, created_at, order_type, side = OrderUtils.order_fields(order)
+                    order_type = order_type or 'unknown'
+                    side = side or 'unknown'
+                    status = status or 'unknown'
 
                     # Check if order is stale - MUCH MORE CONSERVATIVE APPROACH
                     is_stale = False
                     if status == 'new' and created_at:
                         try:
-                            from datetime import timezone
                             # Use consolidated datetime handling
-                            order_age = DateTimeUtils.calculate_age_seconds(created_at)
+                            order_age = DateTimeUtils.calculate_age_seconds(created_at, now)
 
                             # Use configurable stale order timeouts
-                            stale_timeouts = RISK_CONFIG['stale_order_timeouts']
+                            stale_timeouts = RISK.stale_order_timeouts
                             order_type_key = order_type.lower()
 
                             # Map order types to config keys
@@ -517,22 +517,26 @@ class IntelligentTradingSystem:
                             pass
 
                     if is_stale and order_id:
-                        # Cancel stale order
-                        try:
-                            cancel_response = await self.gateway.cancel_order(order_id)
-                            if cancel_response and cancel_response.success:
-                                self.logger.info(f"   ✅ Cancelled stale order {order_id}")
-                                stale_orders_cancelled += 1
-                            else:
-                                self.logger.warning(f"   ⚠️ Failed to cancel stale order {order_id}")
-                                remaining_orders.append(order)
-                        except Exception as e:
-                            self.logger.error(f"   ❌ Error cancelling stale order {order_id}: {e}")
-                            remaining_orders.append(order)
+                        orders_to_cancel.append(order)
                     else:
                         self.logger.info(f"   - {order_type} {side} order, status: {status}")
                         remaining_orders.append(order)
 
+                # Cancel stale orders concurrently
+                cancel_results = await OrderUtils.cancel_orders(
+                    self.gateway, [order.id for order in orders_to_cancel]
+                )
+                for order, cancel_response in zip(orders_to_cancel, cancel_results):
+                    if isinstance(cancel_response, Exception):
+                        self.logger.error(f"   ❌ Error cancelling stale order {order.id}: {cancel_response}")
+                        remaining_orders.append(order)
+                    elif cancel_response.success:
+                        self.logger.info(f"   ✅ Cancelled stale order {order.id}")
+                        stale_orders_cancelled += 1
+                    else:
+                        self.logger.warning(f"   ⚠️ Failed to cancel stale order {order.id}")
+                        remaining_orders.append(order)
+
                 if stale_orders_cancelled > 0:
                     self.logger.info(f"🧹 Cancelled {stale_orders_cancelled} stale orders for {symbol}")
                     # Brief pause to ensure cancellations are processed
@@ -570,7 +574,7 @@ class IntelligentTradingSystem:
                     self.logger.info(f"🔄 Attempting emergency stop for {symbol}: {emergency_stop_data}")
                 
                 # Submit order
-                stop_response = await self.gateway.submit_order(emergency_stop_data)
+                stop_response = await self.gateway.submit_order(emergency_stop_data, priority='EMERGENCY')
                 
                 if stop_response and stop_response.success:
                     order_id = getattr(stop_response.data, 'id', 'unknown')
@@ -592,7 +596,7 @@ class IntelligentTradingSystem:
                         alternative_data['time_in_force'] = 'gtc'
                         
                         self.logger.critical(f"🔄 Trying GTC order for {symbol}: {alternative_data}")
-                        gtc_response = await self.gateway.submit_order(alternative_data)
+                        gtc_response = await self.gateway.submit_order(alternative_data, priority='EMERGENCY')
                         
                         if gtc_response and gtc_response.success:
                             order_id = getattr(gtc_response.data, 'id', 'unknown')
@@ -709,7 +713,7 @@ class IntelligentTradingSystem:
                             self.logger.critical(f"🔄 Liquidation retry {attempt + 1}/3 for {symbol}")
                             await asyncio.sleep(2 ** attempt)  # Exponential backoff
                         
-                        liquidation_response = await self.gateway.submit_order(liquidation_data)
+                        liquidation_response = await self.gateway.submit_order(liquidation_data, priority='EMERGENCY')
                         
                         if liquidation_response and liquidation_response.success:
                             order_id = getattr(liquidation_response.data, 'id', 'unknown')
@@ -773,6 +777,7 @@ class IntelligentTradingSystem:
             
             # Get all open orders
             open_orders = await self.gateway.get_orders('open')
+            orders_by_symbol = OrderUtils.index_by_symbol(open_orders)
             
             # Check protection for each position
             unprotected_positions = []
@@ -785,28 +790,27 @@ class IntelligentTradingSystem:
                 # Look for protective orders for this position
                 has_protection = False
                 
-                for order in open_orders:
-                    if hasattr(order, 'symbol') and order.symbol == symbol:
-                        order_type = getattr(order, 'order_type', getattr(order, 'type', '')).lower()
-                        order_side = getattr(order, 'side', '').lower()
-                        stop_price = getattr(order, 'stop_price', None)
+                for order in orders_by_symbol.get(symbol, ()):
+                    order_type = getattr(order, 'order_type', getattr(order, 'type', '')).lower()
+                    order_side = getattr(order, 'side', '').lower()
+                    stop_price = getattr(order, 'stop_price', None)
                         
-                        # Check for protective orders
-                        is_stop = 'stop' in order_type or stop_price is not None
-                        is_protective_limit = (order_type == 'limit' and 
-                                             ((position_side == 'long' and order_side == 'sell') or
-                                              (position_side == 'short' and order_side == 'buy')))
+                    # Check for protective orders
+                    is_stop = 'stop' in order_type or stop_price is not None
+                    is_protective_limit = (order_type == 'limit' and 
+                                         ((position_side == 'long' and order_side == 'sell') or
+                                          (position_side == 'short' and order_side == 'buy')))
                         
-                        # Check for market liquidation orders (active protection)
-                        is_market_liquidation = (order_type == 'market' and
-                                               ((position_side == 'long' and order_side == 'sell') or
-                                                (position_side == 'short' and order_side == 'buy')))
+                    # Check for market liquidation orders (active protection)
+                    is_market_liquidation = (order_type == 'market' and
+                                           ((position_side == 'long' and order_side == 'sell') or
+                                            (position_side == 'short' and order_side == 'buy')))
                         
-                        if is_stop or is_protective_limit or is_market_liquidation:
-                            has_protection = True
-                            if is_market_liquidation:
-                                self.logger.debug(f"✅ {symbol} protected by active market liquidation order")
-                            break
+                    if is_stop or is_protective_limit or is_market_liquidation:
+                        has_protection = True
+                        if is_market_liquidation:
+                            self.logger.debug(f"✅ {symbol} protected by active market liquidation order")
+                        break
                 
                 if not has_protection:
                     unprotected_positions.append({
@@ -868,7 +872,7 @@ class IntelligentTradingSystem:
                         if symbol in self.recent_emergency_stops:
                             last_stop_time = self.recent_emergency_stops[symbol]
                             time_since_last_stop = (current_time - last_stop_time).total_seconds()
-                            cooldown_seconds = RISK_CONFIG['emergency_stop_recreation_cooldown_minutes'] * 60
+                            cooldown_seconds = RISK.emergency_stop_recreation_cooldown_seconds
                             if time_since_last_stop < cooldown_seconds:
                                 self.logger.info(f"⏭️ Skipping emergency stop for {symbol} - created {time_since_last_stop/60:.1f} minutes ago")
                                 continue
@@ -949,6 +953,7 @@ class IntelligentTradingSystem:
             positions = await self.gateway.get_all_positions()
             active_positions = [pos for pos in positions if float(pos.qty) != 0]
             open_orders = await self.gateway.get_orders('open')
+            orders_by_symbol = OrderUtils.index_by_symbol(open_orders)
             
             if not active_positions:
                 self.logger.info("✅ Periodic verification: No positions to verify")
@@ -964,8 +969,7 @@ class IntelligentTradingSystem:
                 market_value = float(position.market_value)
                 
                 # Find all orders for this symbol
-                symbol_orders = [order for order in open_orders 
-                               if hasattr(order, 'symbol') and order.symbol == symbol]
+                symbol_orders = orders_by_symbol.get(symbol, [])
                 
                 # Categorize orders
                 stop_orders = []
@@ -1079,9 +1083,9 @@ class IntelligentTradingSystem:
                 
             aging_actions = []
             current_time = datetime.now()
-            from config import RISK_CONFIG
-            max_age_days = RISK_CONFIG.get('max_position_age_days', 4)
-            concentration_limit = RISK_CONFIG.get('concentration_limit_pct', 8.0)
+            from config import RISK
+            max_age_days = RISK.max_position_age_days
+            concentration_limit = RISK.concentration_limit_pct
             
             # Get account info for concentration calculations
             account = await self.gateway.get_account_safe()
@@ -1506,7 +1510,7 @@ class IntelligentTradingSystem:
                 
                 # === STALE ORDER CLEANUP (CRITICAL) ===
                 # Clean up stale orders that may be blocking profit-taking
-                if loop_count % RISK_CONFIG['stale_order_cleanup_loop_interval'] == 0:  # Configurable cleanup frequency
+                if loop_count % RISK.stale_order_cleanup_loop_interval == 0:  # Configurable cleanup frequency
                     try:
                         stale_cancelled = await self._cleanup_all_stale_orders()
                         if stale_cancelled > 0:
@@ -1522,7 +1526,7 @@ class IntelligentTradingSystem:
                 
                 # === POSITION PROTECTION MONITORING (CRITICAL) ===
                 # Reduced frequency to prevent excessive stop order creation/cancellation cycles
-                if loop_count % RISK_CONFIG['protection_monitoring_loop_interval'] == 0:  # Configurable monitoring frequency
+                if loop_count % RISK.protection_monitoring_loop_interval == 0:  # Configurable monitoring frequency
                     try:
                         await self._monitor_position_protection()
                     except Exception as e:
@@ -1566,7 +1570,7 @@ class IntelligentTradingSystem:
                     self.logger.error(f"❌ PDT monitoring error: {e}")
                 
                 # === PERIODIC PROTECTION VERIFICATION (Every 5 loops) ===
-                if loop_count % RISK_CONFIG['periodic_protection_verification_loop_interval'] == 0:  # Configurable verification frequency
+                if loop_count % RISK.periodic_protection_verification_loop_interval == 0:  # Configurable verification frequency
                     try:
                         await self._periodic_protection_verification()
                     except Exception as e:
@@ -1581,7 +1585,7 @@ class IntelligentTradingSystem:
                 except:
                     market_open = False
                     
-                if loop_count % RISK_CONFIG['position_aging_management_loop_interval'] == 0 and market_open:  # Configurable aging management frequency
+                if loop_count % RISK.position_aging_management_loop_interval == 0 and market_open:  # Configurable aging management frequency
                     try:
                         await self._enhanced_position_aging_management()
                     except Exception as e:
@@ -1705,7 +1709,7 @@ class IntelligentTradingSystem:
             # Check if opportunity scan is needed
             if (not self.last_opportunity_scan or
                 (datetime.now() - self.last_opportunity_scan).total_seconds() > 
-                FUNNEL_CONFIG['broad_scan_frequency_minutes'] * 60):
+                FUNNEL.broad_scan_frequency_seconds):
                 
                 self.logger.debug("🔍 Executing opportunity discovery...")
                 
@@ -1845,9 +1849,9 @@ class IntelligentTradingSystem:
                     )
                     
                     # AGGRESSIVE TRADING: Allow AI-only evaluation when technical fails but has good data
-                    from config import RISK_CONFIG
+                    from config import RISK
                     allow_ai_only = (not technical_signal and len(bars) >= 10 and 
-                                   RISK_CONFIG['max_position_size_pct'] >= 25.0)  # Only for aggressive config
+                                   RISK.max_position_size_pct >= 25.0)  # Only for aggressive config
                     
                     if technical_signal or allow_ai_only:
                         if technical_signal:
@@ -1956,7 +1960,7 @@ class IntelligentTradingSystem:
             # Check position limits - CRITICAL for risk management
             positions = await self.gateway.get_all_positions()
             active_positions = [p for p in positions if float(p.qty) != 0]
-            max_positions = FUNNEL_CONFIG.get('max_active_positions', 8)
+            max_positions = FUNNEL.max_active_positions
             
             if len(active_positions) >= max_positions:
                 self.logger.warning(f"⚠️ Position limit reached ({len(active_positions)}/{max_positions}) - skipping {signal.symbol}")
@@ -1968,9 +1972,9 @@ class IntelligentTradingSystem:
                 return False
                 
             # Calculate position size based on AI recommendation - AGGRESSIVE 50% ANNUAL RETURN TARGET
-            from config import RISK_CONFIG
-            min_position_size = RISK_CONFIG['min_position_size_pct'] / 100  # 25% minimum
-            max_position_size = RISK_CONFIG['max_position_size_pct'] / 100  # 40% maximum
+            from config import RISK
+            min_position_size = RISK.min_position_size_pct / 100  # 25% minimum
+            max_position_size = RISK.max_position_size_pct / 100  # 40% maximum
             
             # Size based on AI confidence and recommendation - MORE AGGRESSIVE
             size_multiplier = {
@@ -1986,7 +1990,7 @@ class IntelligentTradingSystem:
             self.logger.info(f"🚀 TARGET POSITION: {signal.symbol} = {adjusted_position_size*100:.1f}% of account (subject to position sizing caps)")
             
             # Update signal with AI insights
-            signal.stop_loss_price = signal.entry_price * (1 - RISK_CONFIG['stop_loss_pct'] / 100)
+            signal.stop_loss_price = signal.entry_price * (1 - RISK.stop_loss_fraction)
             signal.take_profit_price = signal.entry_price * (1 + ai_evaluation.get('expected_return_pct', 10) / 100)
             signal.confidence = ai_evaluation.get('confidence', signal.confidence)
             signal.reasoning = f"AI: {ai_evaluation.get('reasoning', 'No reasoning')}"
@@ -2048,7 +2052,7 @@ class IntelligentTradingSystem:
     async def _manage_individual_position(self, position):
         """Manage individual position with autonomous decision making"""
         try:
-            from config import RISK_CONFIG
+            from config import RISK
             symbol = position.symbol
             qty = float(position.qty)
             current_value = float(position.market_value)
@@ -2067,8 +2071,8 @@ class IntelligentTradingSystem:
             if position_entry_time:
                 hours_held = (datetime.now() - position_entry_time).total_seconds() / 3600
                 days_held = hours_held / 24
-                min_hold_hours = RISK_CONFIG['min_holding_period_hours']
-                max_hold_days = RISK_CONFIG.get('max_position_age_days', 4)
+                min_hold_hours = RISK.min_holding_period_hours
+                max_hold_days = RISK.max_position_age_days
                 
                 if hours_held < min_hold_hours:
                     self.logger.info(f"🕐 {symbol}: Swing trading hold - {hours_held:.1f}h/{min_hold_hours}h minimum")
@@ -2096,7 +2100,7 @@ class IntelligentTradingSystem:
             current_price = float(current_quote.get('ask_price', 0)) or float(current_quote.get('bid_price', 0))
             
             # CRITICAL: Enhanced risk management - Loss cutting at -4%
-            max_loss_pct = RISK_CONFIG.get('max_position_loss_pct', -4.0)
+            max_loss_pct = RISK.max_position_loss_pct
             if unrealized_pct <= max_loss_pct:
                 # Check if market is open before attempting loss cuts
                 clock = await self.gateway.get_clock()
@@ -2164,8 +2168,8 @@ class IntelligentTradingSystem:
                     self.logger.error(f"❌ LOSS CUT ERROR: {symbol} - {e}")
             
             # Check for profit taking opportunities - ENHANCED GRANULAR SYSTEM
-            profit_levels = RISK_CONFIG.get('profit_taking_levels', [5.0, 10.0, 15.0])
-            profit_percentages = RISK_CONFIG.get('profit_taking_percentages', [0.15, 0.35, 0.50])
+            profit_levels = RISK.profit_taking_levels
+            profit_percentages = RISK.profit_taking_percentages
             
             for i, profit_level in enumerate(profit_levels):
                 if unrealized_pct >= profit_level:
@@ -2246,8 +2250,8 @@ class IntelligentTradingSystem:
     async def _check_and_reduce_oversized_positions(self, positions: List):
         """Check for oversized positions and reduce them automatically"""
         try:
-            from config import RISK_CONFIG
-            concentration_limit = RISK_CONFIG.get('concentration_limit_pct', 8.0) / 100.0
+            from config import RISK
+            concentration_limit = RISK.concentration_limit_fraction
             
             # Get current account value
             account_info = await self.gateway.get_account()
@@ -2993,7 +2997,7 @@ class IntelligentTradingSystem:
                     "stop_price": stop_price,
                     "time_in_force": "gtc"
                 }
-                stop_order = await self.gateway.submit_order(order_data)
+                stop_order = await self.gateway.submit_order(order_data, priority='EMERGENCY')
                 
                 if stop_order:
                     self.logger.info(f"🤖 AI tighter stop loss set for {symbol} at ${stop_price:.2f}: {reason}")
@@ -3161,7 +3165,7 @@ class IntelligentTradingSystem:
             await self.order_executor.emergency_close_all()
             
             # Cancel all pending orders
-            await self.gateway.cancel_all_orders()
+            await self.gateway.cancel_all_orders(priority='EMERGENCY')
             
             # Generate emergency report
             emergency_report = await self._generate_emergency_report(reason)
@@ -3,12 +3,72 @@ Market status manager for trading hours and market conditions
 """
 
 import logging
-from typing import Dict, Tuple
-from datetime import datetime, time
+from typing import Dict, List, Optional, Tuple
+from datetime import date, datetime, time, timedelta, timezone
+from zoneinfo import ZoneInfo
 import asyncio
+import numpy as np
+from utils import DateTimeUtils
 
 logger = logging.getLogger(__name__)
 
+MARKET_TZ = ZoneInfo('America/New_York')
+MINUTES_PER_DAY = 1440
+CALENDAR_DAYS = 365                              # Sessions precomputed ahead
+CALENDAR_REFRESH_INTERVAL = timedelta(days=7)
+CLOCK_SANITY_INTERVAL = timedelta(hours=3)       # How often to confirm the bitmap against the live clock
+
+class MarketSessionCalendar:
+    """
+    Minute-resolution bitmap of regular trading sessions
+
+    One byte per minute starting at midnight UTC of the first calendar day,
+    so checking whether the market is open (holidays and early closes
+    included) is an array lookup instead of an API round trip.
+    """
+    
+    def __init__(self, sessions: List[Tuple[datetime, datetime]], start_date: date, days: int):
+        self.origin_minute = int(datetime.combine(start_date, time(0), tzinfo=timezone.utc).timestamp()) // 60
+        self.bitmap = np.zeros(days * MINUTES_PER_DAY, dtype=np.uint8)
+        self.session_dates = set()
+        for market_open, market_close in sessions:
+            self.bitmap[max(self._index(market_open), 0):max(self._index(market_close), 0)] = 1
+            self.session_dates.add(market_open.date())
+        self.built_at = datetime.now(timezone.utc)
+        
+    @classmethod
+    def from_alpaca(cls, rows: List[Dict], start_date: date, days: int) -> 'MarketSessionCalendar':
+        """Build from Alpaca /v2/calendar rows ({'date', 'open', 'close'} in exchange time)"""
+        sessions = []
+        for row in rows:
+            day = date.fromisoformat(row['date'])
+            sessions.append((datetime.combine(day, time.fromisoformat(row['open']), tzinfo=MARKET_TZ),
+                             datetime.combine(day, time.fromisoformat(row['close']), tzinfo=MARKET_TZ)))
+        return cls(sessions, start_date, days)
+        
+    def _index(self, dt: datetime) -> int:
+        return int(dt.timestamp()) // 60 - self.origin_minute
+        
+    def covers(self, dt: datetime) -> bool:
+        return 0 <= self._index(dt) < len(self.bitmap)
+        
+    def is_open(self, dt: datetime) -> bool:
+        return bool(self.bitmap[self._index(dt)])
+        
+    def closed_reason(self, dt: datetime) -> str:
+        """Human-readable reason the market is closed at dt"""
+        local = dt.astimezone(MARKET_TZ)
+        if local.weekday() >= 5:
+            return "Weekend - market closed"
+        if local.date() not in self.session_dates:
+            return "Market closed (holiday or special closure)"
+        
+        index = self._index(dt)
+        rest_of_day = self.bitmap[index:index + MINUTES_PER_DAY - (local.hour * 60 + local.minute)]
+        if rest_of_day.any():
+            return f"Market opens in {int(rest_of_day.argmax())} minutes"
+        return "Market closed for the day"
+
 class MarketStatusManager:
     """
     Manages market hours, holidays, and trading conditions
@@ -20,13 +80,82 @@ class MarketStatusManager:
         self.last_status_check = None
         self.extended_hours_monitoring = True  # Monitor positions outside market hours
         self.api_gateway = None  # Will be set by main.py
+        self.session_calendar: Optional[MarketSessionCalendar] = None
+        self.last_clock_check: Optional[datetime] = None
+        # (is_open, valid_until) from the live clock while it disagrees with the bitmap
+        self.clock_override: Optional[Tuple[bool, datetime]] = None
+        
+    async def _get_session_calendar(self, now: datetime) -> Optional[MarketSessionCalendar]:
+        """Current session bitmap, rebuilt weekly from the Alpaca calendar"""
+        calendar = self.session_calendar
+        if calendar and calendar.covers(now) and now - calendar.built_at < CALENDAR_REFRESH_INTERVAL:
+            return calendar
+            
+        start = now.astimezone(MARKET_TZ).date()
+        rows = await self.api_gateway.get_market_calendar(start, start + timedelta(days=CALENDAR_DAYS))
+        if not rows:
+            return calendar if calendar and calendar.covers(now) else None
+            
+        self.session_calendar = MarketSessionCalendar.from_alpaca(rows, start, CALENDAR_DAYS + 1)
+        logger.info(f"📅 Market session calendar built: {len(self.session_calendar.session_dates)} sessions")
+        return self.session_calendar
+        
+    async def _session_calendar_status(self) -> Optional[Tuple[bool, str]]:
+        """Market status from the session bitmap, or None if no calendar is available"""
+        now = datetime.now(timezone.utc)
+        
+        # Keep trusting the clock until its next transition or the next sanity check
+        if self.clock_override:
+            clock_open, valid_until = self.clock_override
+            if now < valid_until:
+                if clock_open:
+                    return True, "Market is open for trading"
+                return False, "Market closed (per market clock)"
+            self.clock_override = None
+            self.last_clock_check = None  # Confirm the rebuilt calendar right away
+            
+        try:
+            calendar = await self._get_session_calendar(now)
+        except Exception as e:
+            logger.warning(f"Session calendar unavailable, using market clock: {e}")
+            return None
+        if calendar is None:
+            return None
+            
+        is_open = calendar.is_open(now)
+        
+        # Periodically confirm against the live clock
+        if self.last_clock_check is None or now - self.last_clock_check >= CLOCK_SANITY_INTERVAL:
+            self.last_clock_check = now
+            clock = await self.api_gateway.get_clock()
+            if clock and bool(clock.is_open) != is_open:
+                logger.warning(f"Session calendar says open={is_open} but market clock says "
+                               f"open={clock.is_open} - using clock and rebuilding calendar")
+                is_open = bool(clock.is_open)
+                valid_until = now + CLOCK_SANITY_INTERVAL
+                transition = DateTimeUtils.parse_datetime(clock.next_close if is_open else clock.next_open)
+                if transition and transition.tzinfo and transition < valid_until:
+                    valid_until = transition
+                self.clock_override = (is_open, valid_until)
+                self.session_calendar = None
+                self.api_gateway.invalidate_market_calendar()
+                if not is_open:
+                    return False, "Market closed (per market clock)"
+                
+        if is_open:
+            return True, "Market is open for trading"
+        return False, calendar.closed_reason(now)
         
     async def should_start_trading(self) -> Tuple[bool, str]:
         """Determine if trading should start"""
         try:
-            # First check with Alpaca API for accurate market status (includes holidays)
+            # First check the precomputed session calendar, then the Alpaca clock (both include holidays)
             if self.api_gateway:
                 try:
+                    status = await self._session_calendar_status()
+                    if status:
+                        return status
+                        
                     clock = await self.api_gateway.get_clock()
                     if clock and hasattr(clock, 'is_open'):
                         if not clock.is_open:
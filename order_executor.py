@@ -53,7 +53,7 @@ class SimpleTradeExecutor:
                 # Use ATR for volatility-adjusted sizing
                 atr_stop_multiple = 2.0  # Stop loss at 2x ATR
                 risk_per_share = signal.atr * atr_stop_multiple
-                dollar_risk_per_trade = account_value * (RISK_CONFIG['max_position_risk_pct'] / 100)
+                dollar_risk_per_trade = account_value * (RISK.max_position_risk_pct / 100)
                 
                 if risk_per_share > 0:
                     quantity = int(dollar_risk_per_trade / risk_per_share)
@@ -382,12 +382,12 @@ class SimpleTradeExecutor:
     async def _enhanced_position_management(self, position, unrealized_pct: float, monitoring_summary: Dict):
         """Enhanced position management with profit taking and loss cutting"""
         try:
-            from config import RISK_CONFIG
+            from config import RISK
             symbol = position.symbol
             qty = float(position.qty)
             
             # 1. LOSS CUTTING: Cut losses at -4%
-            if unrealized_pct <= RISK_CONFIG.get('max_position_loss_pct', -4.0):
+            if unrealized_pct <= RISK.max_position_loss_pct:
                 logger.warning(f"💸 {symbol}: Loss cutting triggered at {unrealized_pct:.1f}%")
                 await self._execute_loss_cut(symbol, qty, unrealized_pct)
                 monitoring_summary['alerts'].append(
@@ -395,7 +395,7 @@ class SimpleTradeExecutor:
                 )
                 
             # 2. PROFIT TAKING: Take partial profits at configured levels
-            profit_levels = RISK_CONFIG.get('profit_taking_levels', [6.0, 12.0])
+            profit_levels = RISK.profit_taking_levels
             for profit_level in profit_levels:
                 if unrealized_pct >= profit_level and not hasattr(self, f'_{symbol}_profit_{int(profit_level)}_taken'):
                     logger.info(f"💰 {symbol}: Profit taking triggered at {unrealized_pct:.1f}%")
@@ -406,7 +406,7 @@ class SimpleTradeExecutor:
                     )
                     
             # 3. TRAILING STOP: Activate trailing stop when in profit
-            trailing_activation = RISK_CONFIG.get('trailing_stop_activation_pct', 3.0)
+            trailing_activation = RISK.trailing_stop_activation_pct
             if unrealized_pct >= trailing_activation:
                 await self._manage_trailing_stop(symbol, unrealized_pct)
                 
@@ -427,7 +427,7 @@ class SimpleTradeExecutor:
                 'time_in_force': 'day'
             }
             
-            response = await self.gateway.submit_order(order_data)
+            response = await self.gateway.submit_order(order_data, priority='EMERGENCY')
             if response.success:
                 logger.info(f"✅ Loss cut order submitted for {symbol}")
             else:
@@ -481,8 +481,8 @@ class SimpleTradeExecutor:
     async def _check_and_reduce_oversized_positions(self, account_value: float, monitoring_summary: Dict):
         """Check for oversized positions and reduce them automatically"""
         try:
-            from config import RISK_CONFIG
-            concentration_limit = RISK_CONFIG.get('concentration_limit_pct', 8.0) / 100.0
+            from config import RISK
+            concentration_limit = RISK.concentration_limit_fraction
             
             positions = await self.gateway.get_all_positions()
             oversized_positions = []
@@ -552,7 +552,7 @@ class SimpleTradeExecutor:
             logger.critical("🚨 EMERGENCY CLOSE ALL POSITIONS INITIATED")
             
             # Cancel all open orders first
-            cancel_success = await self.gateway.cancel_all_orders()
+            cancel_success = await self.gateway.cancel_all_orders(priority='EMERGENCY')
             if cancel_success:
                 logger.info("✅ All open orders cancelled")
             else:
@@ -579,7 +579,7 @@ class SimpleTradeExecutor:
                         'time_in_force': 'day'
                     }
                     
-                    order_response = await self.gateway.submit_order(close_order_data)
+                    order_response = await self.gateway.submit_order(close_order_data, priority='EMERGENCY')
                     
                     if order_response and order_response.success:
                         emergency_orders.append({
@@ -614,7 +614,7 @@ class SimpleTradeExecutor:
                     unrealized_pct = float(position.unrealized_plpc) * 100
                     
                     # Check if approaching critical loss level
-                    if unrealized_pct < -RISK_CONFIG['stop_loss_pct']:
+                    if unrealized_pct < -RISK.stop_loss_pct:
                         alert_msg = (f"🚨 CRITICAL LOSS: {position.symbol} "
                                    f"{unrealized_pct:.1f}% loss exceeds stop limit")
                         alerts.append(alert_msg)
@@ -648,8 +648,8 @@ class SimpleTradeExecutor:
                 cancelled_orders = 0
                 for order in open_orders:
                     if hasattr(order, 'symbol') and order.symbol == symbol:
-                        cancel_response = await self.gateway.cancel_order(order.id)
-                        if cancel_response and cancel_response.success:
+                        cancel_response = await self.gateway.cancel_order(order.id, priority='EMERGENCY')
+                        if cancel_response.success:
                             cancelled_orders += 1
                             logger.critical(f"✅ Cancelled order {order.id} for {symbol}")
                         else:
@@ -674,7 +674,7 @@ class SimpleTradeExecutor:
                 'time_in_force': 'day'
             }
             
-            order_response = await self.gateway.submit_order(emergency_order_data)
+            order_response = await self.gateway.submit_order(emergency_order_data, priority='EMERGENCY')
             
             if order_response and order_response.success:
                 logger.critical(f"🚨 EMERGENCY STOP EXECUTED: {symbol} {side} {close_qty} @ market")
@@ -1000,7 +1000,7 @@ class SimpleTradeExecutor:
                 'time_in_force': 'day'  # Day order safer than GTC for emergency stops
             }
             
-            stop_order_response = await self.gateway.submit_order(emergency_stop_data)
+            stop_order_response = await self.gateway.submit_order(emergency_stop_data, priority='EMERGENCY')
             
             if stop_order_response and stop_order_response.success:
                 logger.critical(f"✅ Emergency stop loss created: {symbol} @ ${signal.stop_loss_price:.2f}")
@@ -1087,7 +1087,7 @@ class SimpleTradeExecutor:
             
             for attempt in range(max_retries):
                 try:
-                    liquidation_response = await self.gateway.submit_order(emergency_liquidation_data)
+                    liquidation_response = await self.gateway.submit_order(emergency_liquidation_data, priority='EMERGENCY')
                     
                     if liquidation_response and liquidation_response.success:
                         logger.critical(f"🚨 EMERGENCY LIQUIDATION EXECUTED: {symbol} {side} {close_qty} (attempt {attempt + 1})")
@@ -1618,8 +1618,8 @@ class SimpleTradeExecutor:
                     orders_cancelled = 0
                     for order in open_orders:
                         if hasattr(order, 'symbol') and order.symbol == symbol:
-                            cancel_response = await self.gateway.cancel_order(order.id)
-                            if cancel_response and cancel_response.success:
+                            cancel_response = await self.gateway.cancel_order(order.id, priority='EMERGENCY')
+                            if cancel_response.success:
                                 orders_cancelled += 1
                                 logger.info(f"🧹 Cancelled pending order for {symbol}: {order.id}")
                     
@@ -1646,7 +1646,7 @@ class SimpleTradeExecutor:
                 'time_in_force': 'day'
             }
             
-            stop_response = await self.gateway.submit_order(emergency_stop_data)
+            stop_response = await self.gateway.submit_order(emergency_stop_data, priority='EMERGENCY')
             if stop_response and stop_response.success:
                 logger.critical(f"✅ Emergency stop loss created: {symbol} @ ${signal.stop_loss_price:.2f}")
                 protection_orders_created += 1
@@ -1701,6 +1701,7 @@ class SimpleTradeExecutor:
         """Clean up completed orders from tracking"""
         try:
             symbols_to_remove = []
+            now = datetime.now()  # One snapshot for every tracked order
             
             for symbol, order_info in self.active_orders.items():
                 # Check order status
@@ -1708,7 +1709,7 @@ class SimpleTradeExecutor:
                 
                 # This would check actual order status via API
                 # For now, remove orders older than 1 day
-                age_hours = (datetime.now() - order_info['submission_time']).total_seconds() / 3600
+                age_hours = (now - order_info['submission_time']).total_seconds() / 3600
                 
                 if age_hours > 24:  # Order older than 24 hours
                     symbols_to_remove.append(symbol)
@@ -1818,7 +1819,7 @@ class SimpleTradeExecutor:
                 for order in open_orders:
                     if getattr(order, 'symbol', None) == symbol:
                         try:
-                            await self.gateway.cancel_order(order.id)
+                            await self.gateway.cancel_order(order.id, priority='EMERGENCY')
                             cancelled_orders += 1
                             logger.info(f"🗑️ Cancelled conflicting order: {order.id}")
                         except Exception as cancel_error:
@@ -1839,7 +1840,7 @@ class SimpleTradeExecutor:
                 'time_in_force': 'gtc'
             }
             
-            stop_response = await self.gateway.submit_order(stop_order_data)
+            stop_response = await self.gateway.submit_order(stop_order_data, priority='EMERGENCY')
             
             # Handle PDT-blocked symbols gracefully
             if stop_response and not stop_response.success and self.gateway.is_symbol_pdt_blocked(symbol):
@@ -1903,7 +1904,7 @@ class SimpleTradeExecutor:
                         order_side = getattr(order, 'side', 'unknown')
                         
                         cancel_response = await self.gateway.cancel_order(order_id)
-                        if cancel_response and cancel_response.success:
+                        if cancel_response.success:
                             logger.info(f"✅ Cancelled {order_type} {order_side} order: {order_id}")
                         else:
                             logger.warning(f"⚠️ Failed to cancel order {order_id}")
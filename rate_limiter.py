@@ -0,0 +1,206 @@
+"""
+Priority-aware token-bucket throttle for Alpaca API requests
+
+Each priority class in RATE_LIMIT_CONFIG['priority_system'] refills its own
+bucket at the rate of its budget allocation; any buffered limit left over
+after the allocations refills an unreserved bucket. A request spends its own
+class's tokens first and then borrows idle tokens from the unreserved bucket
+and the other classes, lowest priority first, so one busy class can use all
+capacity outside the EMERGENCY reserve. The reserve is never lent: only
+EMERGENCY requests spend it. Queued higher-priority requests are served
+before lower-priority ones.
+A sliding-window count of sent requests backs the buckets so that a full
+bucket burst followed by its refill can never exceed the limit in any
+rolling minute. A second window caps the other classes at the limit less the
+reserve, so their bursts cannot crowd EMERGENCY requests out of the first.
+"""
+
+import asyncio
+import logging
+import math
+import time
+from collections import defaultdict, deque
+from typing import Dict, List, Optional
+
+from config import RATE_LIMITS, RateLimitConfig
+
+logger = logging.getLogger(__name__)
+
+# How often a waiter re-checks while a higher-priority request is queued ahead of it
+YIELD_INTERVAL = 0.05
+
+# Priority whose bucket is a hard reserve that no other class may borrow
+RESERVED_PRIORITY = 'EMERGENCY'
+
+
+class TokenBucket:
+    """Continuously refilling token bucket"""
+
+    __slots__ = ('capacity', 'refill_rate', 'tokens', 'last_refill')
+
+    def __init__(self, capacity: float, refill_rate: float):
+        self.capacity = capacity
+        self.refill_rate = refill_rate  # Tokens per second
+        self.tokens = capacity
+        self.last_refill = time.monotonic()
+
+    def refill(self, now: float):
+        """Add tokens accrued since the last refill"""
+        elapsed = now - self.last_refill
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.refill_rate)
+            self.last_refill = now
+
+    def time_until(self, cost: float) -> float:
+        """Seconds until the bucket holds `cost` tokens"""
+        deficit = cost - self.tokens
+        if deficit <= 0:
+            return 0.0
+        return deficit / self.refill_rate
+
+
+class SlidingWindowLimiter:
+    """Rolling count of requests sent within the last window_seconds"""
+
+    __slots__ = ('limit', 'window_seconds', 'sent')
+
+    def __init__(self, limit: int, window_seconds: float):
+        self.limit = limit
+        self.window_seconds = window_seconds
+        self.sent = deque()  # Monotonic send times, oldest first
+
+    def prune(self, now: float):
+        """Forget sends that have left the window"""
+        sent = self.sent
+        cutoff = now - self.window_seconds
+        while sent and sent[0] <= cutoff:
+            sent.popleft()
+
+    def time_until(self, now: float, cost: int) -> float:
+        """Seconds until `cost` more requests fit in the window"""
+        self.prune(now)
+        excess = len(self.sent) + cost - self.limit
+        if excess <= 0:
+            return 0.0
+        return self.sent[excess - 1] + self.window_seconds - now
+
+    def record(self, now: float, cost: int):
+        self.sent.extend([now] * cost)
+
+
+class PriorityThrottle:
+    """
+    Token-bucket allocator keyed by request priority
+
+    A request at a given priority takes one token from its own bucket, or
+    from any lendable bucket with tokens to spare: the unreserved bucket
+    first, then the other classes from lowest priority up. The EMERGENCY
+    bucket is not lendable.
+    """
+
+    def __init__(self, config: RateLimitConfig = RATE_LIMITS, window_seconds: float = 60.0):
+        self.ranks: Dict[str, int] = dict(config.priority_system)  # 1 = highest priority
+        self.buckets: Dict[str, TokenBucket] = {}
+        for priority in self.ranks:
+            budget = config.budget_allocation[config.priority_budgets[priority]]
+            self.buckets[priority] = TokenBucket(budget, budget / window_seconds)
+
+        # Buffered limit not claimed by any allocation is open to every class
+        unreserved = config.max_budget - config.total_budget
+        self.unreserved = TokenBucket(unreserved, unreserved / window_seconds) if unreserved > 0 else None
+        self.window = SlidingWindowLimiter(config.max_budget, window_seconds)
+        reserve = self.buckets[RESERVED_PRIORITY].capacity if RESERVED_PRIORITY in self.buckets else 0
+        self.lent_window = SlidingWindowLimiter(config.max_budget - reserve, window_seconds)
+
+        self.pools: List[TokenBucket] = list(self.buckets.values())
+        if self.unreserved is not None:
+            self.pools.append(self.unreserved)
+
+        # Lending order: unreserved slack, then lowest priority up; the reserve is never lent
+        lenders = [self.buckets[p] for p in sorted(self.ranks, key=self.ranks.get, reverse=True)
+                   if p != RESERVED_PRIORITY]
+        if self.unreserved is not None:
+            lenders.insert(0, self.unreserved)
+        # Buckets each priority may draw from, own bucket first
+        self.sources: Dict[str, List[TokenBucket]] = {
+            priority: [bucket] + [lender for lender in lenders if lender is not bucket]
+            for priority, bucket in self.buckets.items()
+        }
+        self._lock = asyncio.Lock()
+        self._waiting = defaultdict(int)  # rank -> number of pending acquires
+
+    async def acquire(self, priority: str = 'MONITORING', cost: float = 1):
+        """Wait until `cost` tokens are available for `priority` and consume them"""
+        if priority not in self.buckets:
+            raise ValueError(f"Unknown rate limit priority: {priority}")
+        max_cost = max(bucket.capacity for bucket in self.sources[priority])
+        if cost > max_cost:
+            raise ValueError(f"Request cost {cost} exceeds {priority} throttle capacity {max_cost}")
+
+        rank = self.ranks[priority]
+        self._waiting[rank] += 1
+        try:
+            while True:
+                # The lock only guards the token check; waiting happens outside it so a
+                # cancelled waiter never leaves it held
+                async with self._lock:
+                    if self._higher_priority_waiting(rank):
+                        wait = YIELD_INTERVAL
+                    else:
+                        wait = self._try_acquire(priority, cost)
+                        if wait <= 0:
+                            return
+                        logger.debug("Rate limit: %s request waiting %.2fs for tokens", priority, wait)
+                await asyncio.sleep(wait)
+        finally:
+            self._waiting[rank] -= 1
+
+    def available(self) -> Dict[str, int]:
+        """Whole tokens currently available per priority plus the shared bucket"""
+        self._refill_all(time.monotonic())
+        snapshot = {priority: int(bucket.tokens) for priority, bucket in self.buckets.items()}
+        if self.unreserved is not None:
+            snapshot['UNRESERVED'] = int(self.unreserved.tokens)
+        return snapshot
+
+    def requests_in_window(self) -> int:
+        """Requests admitted within the current rolling window"""
+        self.window.prune(time.monotonic())
+        return len(self.window.sent)
+
+    def _higher_priority_waiting(self, rank: int) -> bool:
+        return any(count > 0 for r, count in self._waiting.items() if r < rank)
+
+    def _refill_all(self, now: float):
+        for bucket in self.pools:
+            bucket.refill(now)
+
+    def _find_source(self, priority: str, cost: float) -> Optional[TokenBucket]:
+        """Own bucket if it has tokens, otherwise the first idle lender in lending order"""
+        for bucket in self.sources[priority]:
+            if bucket.tokens >= cost:
+                return bucket
+        return None
+
+    def _try_acquire(self, priority: str, cost: float) -> float:
+        """Consume tokens and return 0, or return seconds to wait before retrying"""
+        now = time.monotonic()
+        sends = math.ceil(cost)
+        reserved = priority == RESERVED_PRIORITY
+        window_wait = self.window.time_until(now, sends)
+        if not reserved:
+            window_wait = max(window_wait, self.lent_window.time_until(now, sends))
+        if window_wait > 0:
+            return window_wait
+
+        self._refill_all(now)
+        source = self._find_source(priority, cost)
+        if source is not None:
+            source.tokens -= cost
+            self.window.record(now, sends)
+            if not reserved:
+                self.lent_window.record(now, sends)
+            return 0.0
+
+        # Whichever usable bucket refills first can serve the retry
+        return min(bucket.time_until(cost) for bucket in self.sources[priority])
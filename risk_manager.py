@@ -63,12 +63,12 @@ class ConservativeRiskManager:
             risk_score = 0.0
             
             # === BASIC POSITION VALIDATION ===
-            if signal.position_size_pct > RISK_CONFIG['max_position_risk_pct']:
+            if signal.position_size_pct > RISK.max_position_risk_pct:
                 warnings.append(f"Position size too large: {signal.position_size_pct}%")
-                signal.position_size_pct = RISK_CONFIG['max_position_risk_pct']
+                signal.position_size_pct = RISK.max_position_risk_pct
                 
             # === RISK/REWARD VALIDATION ===
-            if signal.risk_reward_ratio < RISK_CONFIG['min_risk_reward_ratio']:
+            if signal.risk_reward_ratio < RISK.min_risk_reward_ratio:
                 return RiskAssessment(
                     approved=False,
                     risk_score=1.0,
@@ -98,14 +98,14 @@ class ConservativeRiskManager:
                 
             # === SECTOR CONCENTRATION ===
             sector_exposure = self._calculate_sector_exposure(signal, existing_positions or [])
-            if sector_exposure > RISK_CONFIG['max_sector_concentration']:
+            if sector_exposure > RISK.max_sector_concentration:
                 adjusted_size = signal.position_size_pct * 0.5
                 warnings.append(f"Sector concentration limit, reducing size to {adjusted_size}%")
                 signal.position_size_pct = adjusted_size
                 
             # === CORRELATION RISK ===
             correlation_risk = await self._assess_correlation_risk(signal, existing_positions or [])
-            if correlation_risk > RISK_CONFIG['max_correlation_exposure']:
+            if correlation_risk > RISK.max_correlation_exposure:
                 warnings.append("High correlation risk with existing positions")
                 risk_score += 0.2
                 
@@ -129,7 +129,7 @@ class ConservativeRiskManager:
                 )
                 
             # === FINAL RISK SCORE ===
-            base_risk = signal.position_size_pct / RISK_CONFIG['max_position_risk_pct']
+            base_risk = signal.position_size_pct / RISK.max_position_risk_pct
             confidence_adjustment = (1.0 - signal.confidence) * 0.3
             final_risk_score = base_risk + risk_score + confidence_adjustment
             
@@ -175,7 +175,7 @@ class ConservativeRiskManager:
                 self.risk_metrics['daily_high_water_mark'] = current_account_value
                 
             # Check drawdown limit
-            max_dd = RISK_CONFIG['max_daily_drawdown_pct']
+            max_dd = RISK.max_daily_drawdown_pct
             if current_drawdown_pct > max_dd:
                 if not self.risk_metrics['max_daily_drawdown_hit']:
                     logger.critical(f"🚨 DAILY DRAWDOWN LIMIT EXCEEDED: {current_drawdown_pct:.2f}%")
@@ -212,7 +212,7 @@ class ConservativeRiskManager:
         """Final validation before trade execution"""
         try:
             # PDT rule compliance check
-            if account_value < RISK_CONFIG['account_size_threshold']:
+            if account_value < RISK.account_size_threshold:
                 # Check day trade count to avoid PDT violation
                 day_trades_today = await self._count_day_trades_today()
                 if day_trades_today >= 3:  # Stay under PDT limit
@@ -261,7 +261,7 @@ class ConservativeRiskManager:
         """Assess portfolio concentration risk"""
         try:
             total_positions = len(existing_positions) + 1  # +1 for new position
-            concentration_risk = min(1.0, total_positions / FUNNEL_CONFIG['max_active_positions'])
+            concentration_risk = min(1.0, total_positions / FUNNEL.max_active_positions)
             
             # Calculate position value distribution
             position_values = [float(pos.market_value) for pos in existing_positions if hasattr(pos, 'market_value')]
@@ -277,7 +277,7 @@ class ConservativeRiskManager:
             return {
                 'concentration_risk': concentration_risk,
                 'total_positions': total_positions,
-                'max_positions': FUNNEL_CONFIG['max_active_positions']
+                'max_positions': FUNNEL.max_active_positions
             }
             
         except Exception as e:
@@ -372,7 +372,7 @@ class ConservativeRiskManager:
                 'daily_trades': self.daily_trades,
                 'max_daily_trades': SYSTEM_CONFIG['max_daily_trades'],
                 'trades_remaining': max(0, SYSTEM_CONFIG['max_daily_trades'] - self.daily_trades),
-                'daily_drawdown_limit': RISK_CONFIG['max_daily_drawdown_pct'],
+                'daily_drawdown_limit': RISK.max_daily_drawdown_pct,
                 'daily_drawdown_hit': self.risk_metrics.get('max_daily_drawdown_hit', False),
                 'risk_metrics': self.risk_metrics,
                 'session_trades': len(self.session_trades),
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Test script for the compiled news keyword matcher (no API access needed)
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils import NewsUtils
+
+
+def test_keywords_match_whole_words():
+    """Keywords match as whole words, not as prefixes of longer words"""
+    assert NewsUtils.scan_news("Analyst upgrade lifts ACME") == (['upgrade'], [])
+    assert NewsUtils.scan_news("ACME was upgraded twice this year") == ([], [])
+    assert NewsUtils.scan_news("ACME expansions stall after recalls") == ([], [])
+    assert NewsUtils.scan_news("Earnings beat, then a downgrade") == (['earnings beat'], ['downgrade'])
+    assert NewsUtils.scan_news("Earnings beaten down by guidance cut") == ([], ['guidance cut'])
+
+
+def test_classify_sentiment():
+    assert NewsUtils.classify_sentiment("ACME announces merger and buyback") == 'POSITIVE'
+    assert NewsUtils.classify_sentiment("ACME faces lawsuit over recall") == 'NEGATIVE'
+    assert NewsUtils.classify_sentiment("ACME upgraded, lawsuits pending") == 'NEUTRAL'
+    assert NewsUtils.classify_sentiment("") == 'NEUTRAL'
+
+
+if __name__ == "__main__":
+    print("\n🔍 Testing news keyword matcher\n" + "=" * 50)
+    test_keywords_match_whole_words()
+    print("✅ Keywords match whole words only")
+    test_classify_sentiment()
+    print("✅ Sentiment nets catalyst and negative hits")
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Test script for the priority rate-limit throttle (no API access needed)
+"""
+
+import asyncio
+import sys
+import os
+from unittest import mock
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from config import RATE_LIMITS
+from rate_limiter import PriorityThrottle, RESERVED_PRIORITY
+
+RESERVE = RATE_LIMITS.budget_allocation[RATE_LIMITS.priority_budgets[RESERVED_PRIORITY]]
+LENDABLE_BUDGET = RATE_LIMITS.max_budget - RESERVE
+
+
+class FakeClock:
+    """Monotonic clock that only moves when the throttle sleeps"""
+
+    # Like a real clock, every sleep lasts at least one tick
+    TICK = 0.001
+
+    def __init__(self, start: float = 1000.0):
+        self.now = start
+        self._real_sleep = asyncio.sleep
+
+    def monotonic(self) -> float:
+        return self.now
+
+    async def sleep(self, delay: float):
+        self.now += max(delay, self.TICK)
+        await self._real_sleep(0)
+
+    def patch(self):
+        return mock.patch.multiple('rate_limiter', time=mock.Mock(monotonic=self.monotonic),
+                                   asyncio=mock.Mock(sleep=self.sleep, Lock=asyncio.Lock))
+
+
+async def _cancelled_waiters_release_throttle(cancel_after: float):
+    # A one-second window keeps the drained throttle recovering within the test timeout
+    throttle = PriorityThrottle(window_seconds=1.0)
+
+    # Use up the whole window so every later acquire has to queue
+    for _ in range(LENDABLE_BUDGET):
+        await throttle.acquire('MONITORING')
+    for _ in range(RESERVE):
+        await throttle.acquire(RESERVED_PRIORITY)
+
+    waiters = [asyncio.create_task(throttle.acquire('MONITORING')) for _ in range(200)]
+    waiters.append(asyncio.create_task(throttle.acquire('EXECUTION')))
+    await asyncio.sleep(cancel_after)
+
+    for task in waiters:
+        task.cancel()
+    results = await asyncio.gather(*waiters, return_exceptions=True)
+    unexpected = [r for r in results if r is not None and not isinstance(r, asyncio.CancelledError)]
+    assert not unexpected, f"Cancelled waiters raised {unexpected[:3]}"
+
+    # The lowest priority only gets through if no cancelled waiter is still counted ahead of it
+    await asyncio.wait_for(throttle.acquire('ANALYSIS'), timeout=3)
+
+
+def test_cancelled_waiters_release_throttle():
+    """Cancelling queued acquires must not wedge the throttle for later requests"""
+    # Cancel before, during and after the window reopens
+    for cancel_after in (0.0, 0.1, 0.5):
+        asyncio.run(_cancelled_waiters_release_throttle(cancel_after))
+
+
+async def _admitted_per_minute(priority: str, clock: FakeClock, minutes: int) -> list:
+    """Acquire `priority` back to back and count admissions per simulated minute"""
+    throttle = PriorityThrottle()
+    counts = [0] * minutes
+    start = clock.now
+    while True:
+        await throttle.acquire(priority)
+        minute = int((clock.now - start) // 60)
+        if minute >= minutes:
+            return counts
+        counts[minute] += 1
+
+
+def test_single_priority_gets_lendable_budget():
+    """Idle classes lend their tokens, so one busy class can use everything outside the reserve"""
+    for priority in ('MONITORING', 'EXECUTION', 'ANALYSIS'):
+        clock = FakeClock()
+        with clock.patch():
+            counts = asyncio.run(_admitted_per_minute(priority, clock, minutes=4))
+        assert all(LENDABLE_BUDGET - 1 <= count <= LENDABLE_BUDGET for count in counts), (priority, counts)
+
+
+async def _burst_then_emergency(priority: str, clock: FakeClock):
+    throttle = PriorityThrottle()
+    for _ in range(LENDABLE_BUDGET):
+        await throttle.acquire(priority)
+    assert clock.now == 1000.0, "Lendable capacity should cover the burst without waiting"
+    assert throttle.available()[RESERVED_PRIORITY] == RESERVE
+
+    # Further low-priority requests have to wait rather than dip into the reserve
+    for _ in range(RESERVE):
+        await throttle.acquire(priority)
+    assert clock.now > 1000.0, f"{priority} request spent the {RESERVED_PRIORITY} reserve"
+    assert throttle.available()[RESERVED_PRIORITY] == RESERVE
+
+    resumed = clock.now
+    for _ in range(RESERVE):
+        await throttle.acquire(RESERVED_PRIORITY)
+    assert clock.now == resumed, "Emergency requests waited despite an untouched reserve"
+
+
+def test_burst_cannot_spend_emergency_reserve():
+    """A low-priority burst leaves the EMERGENCY reserve intact for stops and liquidations"""
+    for priority in ('ANALYSIS', 'DISCOVERY', 'MONITORING', 'EXECUTION'):
+        clock = FakeClock()
+        with clock.patch():
+            asyncio.run(_burst_then_emergency(priority, clock))
+
+
+if __name__ == "__main__":
+    print("\n🔍 Testing rate limiter\n" + "=" * 50)
+    test_cancelled_waiters_release_throttle()
+    print("✅ Cancelled waiters release the throttle")
+    test_single_priority_gets_lendable_budget()
+    print(f"✅ A single priority class can use the {LENDABLE_BUDGET}/min outside the reserve")
+    test_burst_cannot_spend_emergency_reserve()
+    print(f"✅ Low-priority bursts cannot spend the {RESERVE}-token {RESERVED_PRIORITY} reserve")
@@ -6,16 +6,8 @@ Simplified test of core system focusing on performance tracking fix
 import asyncio
 import logging
 import sys
-import os
-
-# Add environment variables for API credentials if present
-if os.path.exists('.env'):
-    with open('.env') as f:
-        for line in f:
-            if '=' in line and not line.strip().startswith('#'):
-                key, value = line.strip().split('=', 1)
-                os.environ[key] = value
 
+# config loads API credentials from .env if present
 from config import *
 from api_gateway import ResilientAlpacaGateway
 from ai_market_intelligence import EnhancedAIAssistant
@@ -7,13 +7,54 @@ Consolidated utility functions to eliminate code duplication across the trading
 All shared datetime, order management, and configuration logic centralized here.
 """
 
+import bisect
 import logging
-from datetime import datetime, timezone
-from typing import Optional, List, Dict, Any, Tuple
+import operator
+import time
+import numpy as np
+import orjson
+import dateutil.parser
+from datetime import datetime, timedelta, timezone
+from typing import Optional, List, Dict, Any, Tuple, AsyncIterator
 import asyncio
+from collections import defaultdict
+from functools import lru_cache
+from config import (NEWS_KEYWORD_PATTERN, NEWS_KEYWORD_POLARITY,
+                    HEADLINE_CATALYSTS, HEADLINE_CATALYST_PATTERN)
 
 logger = logging.getLogger(__name__)
 
+# Order attributes read during cleanup, fetched in one call per order
+ORDER_FIELD_NAMES = ('id', 'symbol', 'status', 'created_at', 'type', 'side')
+_ORDER_FIELDS = operator.attrgetter(*ORDER_FIELD_NAMES)
+
+
+@lru_cache(maxsize=None)
+def _fields_getter(names: Tuple[str, ...]):
+    """Prebound attrgetter for a field-name tuple, always returning a tuple"""
+    getter = operator.attrgetter(*names)
+    if len(names) == 1:
+        return lambda order: (getter(order),)
+    return getter
+
+# Below this many orders the scalar loop beats building NumPy arrays
+VECTORIZE_MIN_ORDERS = 64
+
+# Standardized aggressive profit-taking; immutable so every caller can share them
+_PROFIT_LEVELS = (5.0, 8.0, 12.0, 20.0)
+_PROFIT_PCTS = (0.20, 0.30, 0.50, 0.75)
+
+_UTC = timezone.utc
+_EPOCH = datetime(1970, 1, 1, tzinfo=_UTC)
+_ONE_MICROSECOND = timedelta(microseconds=1)
+
+# Strict ISO-8601 parser reused across calls; sits between fromisoformat and the lenient parse
+_ISO_PARSER = dateutil.parser.isoparser()
+
+# format_age units: bisecting on the bounds picks the (suffix, divisor) row
+_AGE_UNIT_BOUNDS = (60.0, 3600.0)
+_AGE_UNITS = (('s', 1.0), ('m', 60.0), ('h', 3600.0))
+
 
 class DateTimeUtils:
     """Centralized datetime handling utilities"""
@@ -36,8 +77,19 @@ class DateTimeUtils:
             return dt_input
 
         if isinstance(dt_input, str):
+            # Fast path: Alpaca timestamps are ISO-8601
+            iso = dt_input[:-1] + '+00:00' if dt_input.endswith('Z') else dt_input
+            try:
+                return datetime.fromisoformat(iso)
+            except ValueError:
+                pass
+
+            try:
+                return _ISO_PARSER.isoparse(dt_input)
+            except ValueError:
+                pass
+
             try:
-                import dateutil.parser
                 return dateutil.parser.parse(dt_input)
             except Exception as e:
                 logger.warning(f"Failed to parse datetime string '{dt_input}': {e}")
@@ -46,12 +98,13 @@ class DateTimeUtils:
         return None
 
     @staticmethod
-    def calculate_age_seconds(created_at: Any) -> Optional[float]:
+    def calculate_age_seconds(created_at: Any, now: Optional[datetime] = None) -> Optional[float]:
         """
         Calculate age of an object in seconds from creation time
 
         Args:
             created_at: Creation timestamp (string or datetime)
+            now: Reference time (UTC); pass one snapshot to age a batch consistently
 
         Returns:
             Age in seconds or None if calculation fails
@@ -61,59 +114,247 @@ class DateTimeUtils:
             return None
 
         try:
-            return (datetime.now(timezone.utc) - parsed_dt).total_seconds()
+            if now is None:
+                now = datetime.now(_UTC)
+            return (now - parsed_dt).total_seconds()
         except Exception as e:
             logger.warning(f"Failed to calculate age for {created_at}: {e}")
             return None
 
+    @staticmethod
+    def to_epoch_ns(dt_input: Any) -> Optional[int]:
+        """
+        Integer nanoseconds since the Unix epoch, for comparison with time.time_ns()
+
+        Returns None for unparseable or timezone-naive timestamps, which
+        can't be placed on the UTC timeline.
+        """
+        parsed_dt = DateTimeUtils.parse_datetime(dt_input)
+        if parsed_dt is None or parsed_dt.tzinfo is None:
+            return None
+        return (parsed_dt - _EPOCH) // _ONE_MICROSECOND * 1000
+
     @staticmethod
     def format_age(age_seconds: float) -> str:
         """Format age in seconds to human readable string"""
-        if age_seconds < 60:
-            return f"{age_seconds:.1f}s"
-        elif age_seconds < 3600:
-            return f"{age_seconds/60:.1f}m"
-        else:
-            return f"{age_seconds/3600:.1f}h"
+        unit, scale = _AGE_UNITS[bisect.bisect_right(_AGE_UNIT_BOUNDS, age_seconds)]
+        return f"{age_seconds / scale:.1f}{unit}"
 
 
 class OrderUtils:
     """Centralized order management utilities"""
 
     @staticmethod
-    def is_order_stale(order: Any, threshold_seconds: float = 120) -> Tuple[bool, str]:
+    def order_fields(order: Any, names: Tuple[str, ...] = ORDER_FIELD_NAMES) -> Tuple:
+        """
+        Return the named order attributes in one call, None for missing fields
+
+        Defaults to (id, symbol, status, created_at, type, side).
+        """
+        getter = _ORDER_FIELDS if names is ORDER_FIELD_NAMES else _fields_getter(names)
+        try:
+            return getter(order)
+        except AttributeError:
+            return tuple(getattr(order, name, None) for name in names)
+
+    @staticmethod
+    def created_ns(order: Any) -> Optional[int]:
+        """
+        Creation time in integer nanoseconds since the Unix epoch
+
+        Every staleness check ages orders in this one representation. Gateway
+        orders carry created_ns from decode time; other order objects have
+        their created_at parsed. None if unknown or timezone-naive.
+        """
+        created_ns = getattr(order, 'created_ns', None)
+        if created_ns is not None:
+            return created_ns
+        return DateTimeUtils.to_epoch_ns(getattr(order, 'created_at', None))
+
+    @staticmethod
+    def is_order_stale(order: Any, threshold_seconds: float = 120,
+                       now: Optional[datetime] = None) -> Tuple[bool, str]:
         """
         Check if an order is stale based on age and status
 
         Args:
             order: Order object with created_at and status attributes
             threshold_seconds: Age threshold in seconds (default 2 minutes)
+            now: Reference time (UTC), defaults to the current time
 
         Returns:
             Tuple of (is_stale: bool, reason: str)
         """
         status = getattr(order, 'status', None)
-        created_at = getattr(order, 'created_at', None)
+        created_ns = OrderUtils.created_ns(order) if status == 'new' else None
+        now_ns = DateTimeUtils.to_epoch_ns(now) if now is not None else time.time_ns()
+        return OrderUtils.check_staleness(status, created_ns, threshold_seconds, now_ns)
 
+    @staticmethod
+    def check_staleness(status: Optional[str], created_ns: Optional[int], threshold_seconds: float,
+                        now_ns: Optional[int]) -> Tuple[bool, str]:
+        """Staleness check on already-extracted order status and creation time (epoch ns)"""
         if status != 'new':
             return False, f"status is '{status}', not 'new'"
 
-        if not created_at:
-            return False, "no creation time available"
-
-        age_seconds = DateTimeUtils.calculate_age_seconds(created_at)
-        if age_seconds is None:
+        if created_ns is None or now_ns is None:
             return False, "could not calculate age"
 
-        if age_seconds > threshold_seconds:
-            age_str = DateTimeUtils.format_age(age_seconds)
-            return True, f"age {age_str} exceeds {threshold_seconds/60:.1f}m threshold"
+        age_ns = now_ns - created_ns
+        if age_ns > OrderUtils.threshold_ns(threshold_seconds):
+            return True, OrderUtils.stale_reason(age_ns / 1e9, threshold_seconds)
+
+        return False, f"age {DateTimeUtils.format_age(age_ns / 1e9)} under threshold"
+
+    @staticmethod
+    def threshold_ns(threshold_seconds: float) -> int:
+        return int(threshold_seconds * 1_000_000_000)
+
+    @staticmethod
+    def stale_reason(age_seconds: float, threshold_seconds: float) -> str:
+        return f"age {DateTimeUtils.format_age(age_seconds)} exceeds {threshold_seconds/60:.1f}m threshold"
+
+    @staticmethod
+    def stale_mask(orders: List[Any], threshold_seconds: float, now_ns: int) -> np.ndarray:
+        """
+        Boolean mask of stale orders, computed in one vectorized pass
+
+        Same integer-nanosecond comparison as check_staleness. Orders whose
+        creation time is unknown are aged zero, so they never count as stale.
+        """
+        count = len(orders)
+        created_ns = np.fromiter((now_ns if ns is None else ns for ns in map(OrderUtils.created_ns, orders)),
+                                 dtype=np.int64, count=count)
+        is_new = np.fromiter((getattr(order, 'status', None) == 'new' for order in orders),
+                             dtype=bool, count=count)
+        return is_new & (now_ns - created_ns > OrderUtils.threshold_ns(threshold_seconds))
+
+    @staticmethod
+    def index_by_symbol(orders: Optional[List[Any]]) -> Dict[str, List[Any]]:
+        """Group orders by symbol so per-symbol lookups are O(1) instead of a scan each"""
+        index = defaultdict(list)
+        for order in orders or ():
+            index[getattr(order, 'symbol', None)].append(order)
+        return dict(index)
+
+    @staticmethod
+    def start_cancels(gateway, order_ids: List[str], max_concurrency: int = 8) -> List[asyncio.Task]:
+        """Schedule one cancel task per order id with at most max_concurrency requests in flight"""
+        semaphore = asyncio.Semaphore(max_concurrency)
 
-        return False, f"age {DateTimeUtils.format_age(age_seconds)} under threshold"
+        async def _cancel(order_id):
+            async with semaphore:
+                return await gateway.cancel_order(order_id)
+
+        return [asyncio.create_task(_cancel(order_id)) for order_id in order_ids]
+
+    @staticmethod
+    async def cancel_orders(gateway, order_ids: List[str], max_concurrency: int = 8) -> List[Any]:
+        """
+        Cancel orders concurrently with at most max_concurrency requests in flight
+
+        Returns one entry per order id, in order: the gateway's cancel response
+        (an ApiResponse, never None) or the exception raised while cancelling.
+        """
+        return await asyncio.gather(*OrderUtils.start_cancels(gateway, order_ids, max_concurrency),
+                                    return_exceptions=True)
+
+    @staticmethod
+    def find_stale_orders(open_orders: List[Any], symbol: Optional[str] = None,
+                          threshold_seconds: float = 120) -> List[Tuple[str, str, str, str, float]]:
+        """
+        Identify stale orders locally from an already-fetched order list
+
+        Returns:
+            (order_id, symbol, order_type, side, age_seconds) for each stale order
+        """
+        stale_orders = []
+        order_fields = OrderUtils.order_fields
+        created_ns_of = OrderUtils.created_ns
+        # One clock read per sweep so every order is aged against the same instant
+        now_ns = time.time_ns()
+        threshold_ns = OrderUtils.threshold_ns(threshold_seconds)
+
+        candidates = open_orders
+        if len(open_orders) >= VECTORIZE_MIN_ORDERS:
+            # Vectorized triage for large books; the loop below then only visits stale orders
+            stale_indices = np.flatnonzero(OrderUtils.stale_mask(open_orders, threshold_seconds, now_ns))
+            candidates = [open_orders[i] for i in stale_indices]
+
+        for order in candidates:
+            # Cheap pre-filters first: only 'new' orders can be stale
+            status = getattr(order, 'status', None)
+            if status != 'new':
+                continue
+            if symbol and getattr(order, 'symbol', None) != symbol:
+                continue
+
+            # Integer age from the epoch cached at parse time
+            created_ns = created_ns_of(order)
+            if created_ns is None or now_ns - created_ns <= threshold_ns:
+                continue
+            age_seconds = (now_ns - created_ns) / 1e9
+
+            # Metadata is only extracted for stale orders
+            order_id, order_symbol, _, _, order_type, side = order_fields(order)
+            if not order_id:
+                continue
+            stale_orders.append((order_id, order_symbol or 'unknown',
+                                 order_type or 'unknown', side or 'unknown', age_seconds))
+
+        return stale_orders
+
+    @staticmethod
+    async def cleanup_stale_orders_stream(gateway, symbol: Optional[str] = None,
+                                          threshold_seconds: float = 120,
+                                          max_concurrency: int = 8, *,
+                                          prefetched_orders: Optional[List[Any]] = None
+                                          ) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Cancel stale orders, yielding each result while later cancels are still in flight
+
+        All cancels are started up front through start_cancels (at most
+        max_concurrency in flight) and results are yielded in stale-order sequence
+        as (order_id, response), where response is the gateway's cancel response
+        or the exception raised. If the consumer stops iterating early, closing
+        the generator waits for the remaining cancels to finish.
+        """
+        open_orders = prefetched_orders
+        if open_orders is None:
+            open_orders = await gateway.get_orders(status='open', limit=500)
+        if not open_orders:
+            return
+
+        stale_orders = OrderUtils.find_stale_orders(open_orders, symbol, threshold_seconds)
+        if not stale_orders:
+            return
+
+        # One log record per phase rather than one per order; the per-order
+        # lines are only built when a handler will actually emit them
+        if logger.isEnabledFor(logging.WARNING):
+            logger.warning("🧹 Found %d stale orders:\n%s", len(stale_orders), "\n".join(
+                f"   {order_symbol} - {order_type} {side}, "
+                f"{OrderUtils.stale_reason(age_seconds, threshold_seconds)}"
+                for _, order_symbol, order_type, side, age_seconds in stale_orders
+            ))
+
+        tasks = OrderUtils.start_cancels(gateway, [stale[0] for stale in stale_orders], max_concurrency)
+        try:
+            for (order_id, *_), task in zip(stale_orders, tasks):
+                try:
+                    cancel_response = await task
+                except Exception as e:
+                    cancel_response = e
+                yield order_id, cancel_response
+        finally:
+            # Let in-flight cancels complete; they are only cancelled if the consumer itself is
+            await asyncio.gather(*tasks, return_exceptions=True)
 
     @staticmethod
     async def cleanup_stale_orders(gateway, symbol: Optional[str] = None,
-                                 threshold_seconds: float = 120) -> int:
+                                 threshold_seconds: float = 120,
+                                 max_concurrency: int = 8, *,
+                                 prefetched_orders: Optional[List[Any]] = None) -> int:
         """
         Clean up stale orders for a specific symbol or all symbols
 
@@ -121,47 +362,35 @@ class OrderUtils:
             gateway: API gateway instance
             symbol: Specific symbol to clean (None for all symbols)
             threshold_seconds: Age threshold for stale orders
+            max_concurrency: Maximum cancel requests in flight at once
+            prefetched_orders: Open orders the caller already fetched; skips the API call
 
         Returns:
             Number of orders cancelled
         """
         try:
-            open_orders = await gateway.get_orders(status='open')
-            if not open_orders:
-                return 0
-
-            # Filter by symbol if specified
-            target_orders = open_orders
-            if symbol:
-                target_orders = [order for order in open_orders
-                               if getattr(order, 'symbol', None) == symbol]
-
             cancelled_count = 0
-
-            for order in target_orders:
-                order_id = getattr(order, 'id', None)
-                order_symbol = getattr(order, 'symbol', 'unknown')
-                order_type = getattr(order, 'type', 'unknown')
-                side = getattr(order, 'side', 'unknown')
-
-                is_stale, reason = OrderUtils.is_order_stale(order, threshold_seconds)
-
-                if is_stale and order_id:
-                    logger.warning(f"🧹 STALE ORDER: {order_symbol} - {order_type} {side}, {reason}")
-
-                    try:
-                        cancel_response = await gateway.cancel_order(order_id)
-                        if cancel_response and cancel_response.success:
-                            logger.info(f"   ✅ Cancelled stale order {order_id}")
-                            cancelled_count += 1
-                        else:
-                            logger.warning(f"   ⚠️ Failed to cancel stale order {order_id}")
-                    except Exception as e:
-                        logger.error(f"   ❌ Error cancelling order {order_id}: {e}")
+            failures = []
+            async for order_id, cancel_response in OrderUtils.cleanup_stale_orders_stream(
+                gateway, symbol, threshold_seconds, max_concurrency,
+                prefetched_orders=prefetched_orders
+            ):
+                if isinstance(cancel_response, Exception):
+                    failures.append((order_id, cancel_response))
+                elif cancel_response.success:
+                    cancelled_count += 1
+                else:
+                    failures.append((order_id, None))
+
+            if failures and logger.isEnabledFor(logging.WARNING):
+                logger.warning("🧹 %d stale orders not cancelled:\n%s", len(failures), "\n".join(
+                    f"   ❌ Error cancelling order {order_id}: {error}" if error is not None
+                    else f"   ⚠️ Failed to cancel stale order {order_id}"
+                    for order_id, error in failures
+                ))
 
             if cancelled_count > 0:
-                logger.info(f"🧹 Cleanup complete: {cancelled_count} stale orders cancelled")
-                await asyncio.sleep(0.5)  # Brief pause for API processing
+                logger.info("🧹 Cleanup complete: %d stale orders cancelled", cancelled_count)
 
             return cancelled_count
 
@@ -180,12 +409,9 @@ class ConfigurationValidator:
         return config_dict.get('max_active_positions', 30)
 
     @staticmethod
-    def get_profit_taking_config() -> Tuple[List[float], List[float]]:
-        """Get consistent profit-taking configuration"""
-        # Standardized aggressive profit-taking
-        profit_levels = [5.0, 8.0, 12.0, 20.0]
-        profit_percentages = [0.20, 0.30, 0.50, 0.75]
-        return profit_levels, profit_percentages
+    def get_profit_taking_config() -> Tuple[Tuple[float, ...], Tuple[float, ...]]:
+        """Get consistent profit-taking configuration (shared read-only tuples)"""
+        return _PROFIT_LEVELS, _PROFIT_PCTS
 
     @staticmethod
     def validate_configuration(config_dict: Dict[str, Any]) -> Dict[str, Any]:
@@ -206,6 +432,107 @@ class ConfigurationValidator:
         return validated
 
 
+class NewsUtils:
+    """Keyword-based news catalyst detection"""
+
+    @staticmethod
+    def scan_news(text: str) -> Tuple[List[str], List[str]]:
+        """
+        Find configured catalyst and negative keywords in a news text
+
+        Args:
+            text: Headline or article body
+
+        Returns:
+            Tuple of (catalyst_hits, negative_hits)
+        """
+        catalyst_hits, negative_hits = [], []
+        if not text:
+            return catalyst_hits, negative_hits
+
+        for match in NEWS_KEYWORD_PATTERN.finditer(text.lower()):
+            keyword = match.group(0)
+            if NEWS_KEYWORD_POLARITY[keyword] > 0:
+                catalyst_hits.append(keyword)
+            else:
+                negative_hits.append(keyword)
+
+        return catalyst_hits, negative_hits
+
+    @staticmethod
+    def classify_sentiment(text: str) -> str:
+        """Net keyword sentiment of a news text: POSITIVE, NEGATIVE or NEUTRAL"""
+        catalyst_hits, negative_hits = NewsUtils.scan_news(text)
+        net_score = len(catalyst_hits) - len(negative_hits)
+        if net_score > 0:
+            return 'POSITIVE'
+        if net_score < 0:
+            return 'NEGATIVE'
+        return 'NEUTRAL'
+
+    @staticmethod
+    def headline_catalyst(headline: str) -> str:
+        """Highest-priority catalyst category named in a headline, or 'general news'"""
+        best = min((int(match.lastgroup[1:])
+                    for match in HEADLINE_CATALYST_PATTERN.finditer(headline.lower())), default=None)
+        if best is None:
+            return 'general news'
+        return HEADLINE_CATALYSTS[best][0]
+
+
+class TTLCache:
+    """Async in-memory cache whose entries expire after a fixed time-to-live"""
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[Any, Tuple[float, Any]] = {}  # key -> (expires_at, value)
+        self._lock = asyncio.Lock()
+
+    async def get(self, fetch, key: Any = None):
+        """
+        Return the cached value for key, calling fetch() on a miss
+
+        Concurrent misses share a single fetch. Falsy results (failed
+        requests) are returned but not cached.
+        """
+        entry = self._entries.get(key)
+        if entry and time.monotonic() < entry[0]:
+            return entry[1]
+
+        async with self._lock:
+            entry = self._entries.get(key)
+            if entry and time.monotonic() < entry[0]:
+                return entry[1]
+
+            value = await fetch()
+            if value:
+                self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            return value
+
+    def invalidate(self, key: Any = None):
+        """Drop one cached entry, or all entries when key is None"""
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+
+class JsonLogFormatter(logging.Formatter):
+    """Single-line JSON log records serialized with orjson"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': record.created,
+            'lvl': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+            'cat': getattr(record, 'category', None)
+        }
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return orjson.dumps(entry, default=str).decode()
+
+
 class PerformanceUtils:
     """Performance monitoring and optimization utilities"""
 
@@ -220,11 +547,20 @@ class PerformanceUtils:
     @staticmethod
     def format_percentage(value: float, precision: int = 1) -> str:
         """Consistently format percentage values"""
+        # Literal specs for the common precisions; nested specs are re-parsed each call
+        if precision == 1:
+            return f"{value:.1f}%"
+        if precision == 2:
+            return f"{value:.2f}%"
         return f"{value:.{precision}f}%"
 
     @staticmethod
     def format_currency(value: float, precision: int = 2) -> str:
         """Consistently format currency values"""
+        if precision == 2:
+            return f"${value:,.2f}"
+        if precision == 0:
+            return f"${value:,.0f}"
         return f"${value:,.{precision}f}"
 
 
@@ -244,6 +580,9 @@ __all__ = [
     'DateTimeUtils',
     'OrderUtils',
     'ConfigurationValidator',
+    'NewsUtils',
+    'TTLCache',
+    'JsonLogFormatter',
     'PerformanceUtils',
     'parse_datetime_safe',
     'calculate_order_age'